@@ -1,6 +1,6 @@
-import os
 import requests
-from .base_checker import BaseChecker
+from .base_checker import BaseChecker, reports
+from utils.file_scanner import FileScanner
 
 
 class ApplicationChecker(BaseChecker):
@@ -10,18 +10,24 @@ class ApplicationChecker(BaseChecker):
             'web_roots', ['/var/www/html'])
         self.target_urls = config.get('web_server', {}).get(
             'target_urls', ['http://localhost'])
-
-    def run_checks(self):
-        """Run all application security checks"""
-        results = []
-
-        results.append(self.check_robots_txt())
-        results.append(self.check_production_config())
-        results.append(self.check_cloudflare_proxy())
-        results.append(self.check_test_data_cleanup())
-
-        return results
-
+        self.scanner = FileScanner.from_config(config, self.is_cancelled, self.track_workers)
+
+    def run_checks(self, local_only=False):
+        """Run all application security checks; local_only skips the HTTP ones"""
+        if local_only:
+            return self.run_check_list([
+                (self.check_production_config,),
+                (self.check_test_data_cleanup,),
+            ])
+
+        return self.run_check_list([
+            (self.check_robots_txt,),
+            (self.check_production_config,),
+            (self.check_cloudflare_proxy,),
+            (self.check_test_data_cleanup,),
+        ])
+
+    @reports("Robots.txt Configuration")
     def check_robots_txt(self):
         """Check if robots.txt is properly configured"""
         try:
@@ -32,7 +38,7 @@ class ApplicationChecker(BaseChecker):
                     robots_url = f"{url}/robots.txt"
 
                 try:
-                    response = requests.get(robots_url, timeout=10)
+                    response = requests.get(robots_url, timeout=self.network_timeout())
                     if response.status_code == 200:
                         content = response.text.lower()
                         if 'disallow:' in content and 'user-agent:' in content:
@@ -49,11 +55,10 @@ class ApplicationChecker(BaseChecker):
         except Exception as e:
             return self.create_result("Robots.txt Configuration", False, f"Error checking robots.txt: {str(e)}")
 
+    @reports("Production Configuration")
     def check_production_config(self):
         """Check if application is configured for production environment"""
         try:
-            debug_indicators = []
-
             # Check for debug settings in common config files
             config_patterns = [
                 ('*.env', 'APP_DEBUG=true'),
@@ -63,22 +68,20 @@ class ApplicationChecker(BaseChecker):
                 ('*.php', 'display_errors.*On')
             ]
 
-            for web_root in self.web_roots:
-                if os.path.exists(web_root):
-                    for pattern, debug_string in config_patterns:
-                        stdout, stderr, returncode = self.run_command(
-                            f"find {web_root} -name '{pattern}' -exec grep -l '{debug_string}' {{}} \\; 2>/dev/null")
-                        if stdout.strip():
-                            debug_indicators.extend(stdout.strip().split('\n'))
+            debug_indicators, details = self.facts.scan(
+                self.scanner, 'grep_files', self.web_roots, config_patterns)
 
             if debug_indicators:
-                return self.create_result("Production Configuration", False, f"Debug settings found in: {', '.join(debug_indicators[:3])}")
+                return self.create_result("Production Configuration", False, f"Debug settings found in: {', '.join(debug_indicators[:3])}", details=details)
+            elif not self.scanner.complete:
+                return self.create_result("Production Configuration", False, self.scanner.pause_message(), "low", details=details)
             else:
-                return self.create_result("Production Configuration", True, "No obvious debug settings found")
+                return self.create_result("Production Configuration", True, "No obvious debug settings found", details=details)
 
         except Exception as e:
             return self.create_result("Production Configuration", False, f"Error checking production config: {str(e)}")
 
+    @reports("Cloudflare Proxy")
     def check_cloudflare_proxy(self):
         """Check if site is proxied through Cloudflare"""
         try:
@@ -87,7 +90,7 @@ class ApplicationChecker(BaseChecker):
 
             for url in self.target_urls:
                 try:
-                    response = requests.get(url, timeout=10)
+                    response = requests.get(url, timeout=self.network_timeout())
                     headers = {k.lower(): v.lower()
                                for k, v in response.headers.items()}
 
@@ -108,10 +111,10 @@ class ApplicationChecker(BaseChecker):
         except Exception as e:
             return self.create_result("Cloudflare Proxy", False, f"Error checking Cloudflare proxy: {str(e)}")
 
+    @reports("Test Data Cleanup")
     def check_test_data_cleanup(self):
         """Check for test data and development artifacts"""
         try:
-            test_artifacts = []
             test_patterns = [
                 'test.php',
                 'phpinfo.php',
@@ -123,18 +126,15 @@ class ApplicationChecker(BaseChecker):
                 'demo_*'
             ]
 
-            for web_root in self.web_roots:
-                if os.path.exists(web_root):
-                    for pattern in test_patterns:
-                        stdout, stderr, returncode = self.run_command(
-                            f"find {web_root} -name '{pattern}' 2>/dev/null")
-                        if stdout.strip():
-                            test_artifacts.extend(stdout.strip().split('\n'))
+            test_artifacts, details = self.facts.scan(
+                self.scanner, 'find_files', self.web_roots, test_patterns)
 
             if test_artifacts:
-                return self.create_result("Test Data Cleanup", False, f"Test artifacts found: {', '.join(test_artifacts[:5])}")
+                return self.create_result("Test Data Cleanup", False, f"Test artifacts found: {', '.join(test_artifacts[:5])}", details=details)
+            elif not self.scanner.complete:
+                return self.create_result("Test Data Cleanup", False, self.scanner.pause_message(), "low", details=details)
             else:
-                return self.create_result("Test Data Cleanup", True, "No obvious test artifacts found")
+                return self.create_result("Test Data Cleanup", True, "No obvious test artifacts found", details=details)
 
         except Exception as e:
             return self.create_result("Test Data Cleanup", False, f"Error checking test data: {str(e)}")
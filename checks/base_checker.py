@@ -1,27 +1,201 @@
+import os
+import signal
+import threading
+import time
+import uuid
 from datetime import datetime
 
+from utils.host_facts import HostFacts
+
+
+def reports(*check_names, targets=None):
+    """Declare the result names a check method returns
+
+    A check cancelled by the deadline is then reported under the same names
+    and targets as a finished one, so its history and metrics line up.
+    targets(checker, *args) returns the targets the check reports one
+    result each for; by default a string first argument is the target.
+    """
+    def decorate(check):
+        check.check_names = check_names
+        check.check_targets = targets
+        return check
+    return decorate
+
+
+class CheckCancelled(Exception):
+    """Raised inside a check's worker threads once its deadline has passed"""
+
+
+class CheckContext:
+    """Deadline and cancellation state for one check running under a time budget"""
+
+    def __init__(self, expires_at):
+        self.expires_at = expires_at
+        self.cancelled = threading.Event()
+        self.processes = []
+        self.workers = []
+
+    def remaining(self):
+        """Seconds left before the check is cancelled"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def cancel(self):
+        """Flag the check as cancelled and kill every process it started"""
+        self.cancelled.set()
+        for process in self.processes:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        # Worker processes of the check's own file scan pools
+        for worker in self.workers:
+            worker.kill()
+
 
 class BaseChecker:
+    NETWORK_TIMEOUT = 10
+
     def __init__(self, config):
         self.config = config
+        self.deadline = None
+        self.facts = HostFacts()
+        self._local = threading.local()
 
-    def create_result(self, check_name, passed, message, severity="medium"):
+    def create_result(self, check_name, passed, message, severity="medium", target=None, details=None):
         """Create a standardized result object"""
         return {
             "check_name": check_name,
             "passed": passed,
             "message": message,
             "severity": severity,
+            "target": target,
+            "details": details,
             "timestamp": datetime.now().isoformat(),
             "category": self.__class__.__name__.replace("Checker", "").replace("Security", "")
         }
 
+    def create_timeout_result(self, check, args, timeout):
+        """Create the result(s) reported for a check cancelled by the deadline"""
+        check_names = getattr(check, 'check_names', None) or \
+            (check.__name__.replace("check_", "", 1).replace("_", " ").title(),)
+        check_targets = getattr(check, 'check_targets', None)
+        if check_targets is not None:
+            targets = check_targets(self, *args)
+        else:
+            targets = [args[0] if args and isinstance(args[0], str) else None]
+
+        results = []
+        for check_name in check_names:
+            for target in targets:
+                # The share varies from run to run, so it stays out of the message
+                result = self.create_result(check_name, False, "Check did not finish within its share of the run deadline", target=target, details={"timeout_seconds": round(timeout, 1)})
+                result["status"] = "TIMEOUT"
+                results.append(result)
+        return results[0] if len(results) == 1 else results
+
+    def _context(self):
+        """Deadline context of the check running on this thread, if any"""
+        return getattr(self._local, 'context', None)
+
+    def is_cancelled(self):
+        """True if the check running on this thread has been cancelled"""
+        context = self._context()
+        return context is not None and context.cancelled.is_set()
+
+    def cancellation_flag(self):
+        """Callable telling worker threads started by this check whether it was cancelled"""
+        context = self._context()
+        if context is None:
+            return lambda: False
+        return context.cancelled.is_set
+
+    def track_workers(self, workers):
+        """Kill worker processes along with the check running on this thread"""
+        context = self._context()
+        if context is not None:
+            context.workers.extend(workers)
+
+    def network_timeout(self):
+        """Timeout for one network operation, capped by the check's deadline"""
+        context = self._context()
+        if context is None:
+            return self.NETWORK_TIMEOUT
+        return max(0.1, min(self.NETWORK_TIMEOUT, context.remaining()))
+
+    def _run_with_deadline(self, check, args, timeout):
+        """Run a check on a worker thread, cancelling it when its time is up"""
+        context = CheckContext(time.monotonic() + timeout)
+        outcome = {}
+
+        def target():
+            self._local.context = context
+            try:
+                outcome["value"] = check(*args)
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout)
+
+        if thread.is_alive():
+            context.cancel()
+            return self.create_timeout_result(check, args, timeout)
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["value"]
+
+    def run_check(self, check, *args, timeout=None):
+        """Run one check method and record its duration on the result(s)
+
+        Every result of one call also gets the same invocation id, so the
+        duration can be counted once per call rather than once per result.
+        """
+        started = time.monotonic()
+        if timeout is None:
+            outcome = check(*args)
+        elif timeout <= 0:
+            outcome = self.create_timeout_result(check, args, 0)
+        else:
+            outcome = self._run_with_deadline(check, args, timeout)
+        duration = round(time.monotonic() - started, 6)
+        invocation = uuid.uuid4().hex
+        for result in outcome if isinstance(outcome, list) else [outcome]:
+            result["duration"] = duration
+            result["invocation"] = invocation
+        return outcome
+
+    def run_check_list(self, checks):
+        """Run (check, *args) tuples in order, splitting the checker's deadline between them"""
+        results = []
+        for index, (check, *args) in enumerate(checks):
+            timeout = None
+            if self.deadline is not None:
+                timeout = self.deadline.share(len(checks) - index)
+            outcome = self.run_check(check, *args, timeout=timeout)
+            results.extend(outcome if isinstance(outcome, list) else [outcome])
+        return results
+
     def run_command(self, command):
         """Execute shell command and return output"""
         import subprocess
+        context = self._context()
         try:
-            result = subprocess.run(
-                command, shell=True, capture_output=True, text=True)
-            return result.stdout, result.stderr, result.returncode
+            process = subprocess.Popen(
+                command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, start_new_session=True)
+            if context is None:
+                stdout, stderr = process.communicate()
+                return stdout, stderr, process.returncode
+
+            context.processes.append(process)
+            try:
+                stdout, stderr = process.communicate(timeout=context.remaining())
+                return stdout, stderr, process.returncode
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.communicate()
+                return "", "Command timed out", 124
         except Exception as e:
             return "", str(e), 1
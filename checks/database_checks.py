@@ -1,5 +1,7 @@
 import subprocess
-from .base_checker import BaseChecker
+from .base_checker import BaseChecker, reports
+from utils.connection_pool import ConnectionPool
+from utils.file_scanner import FileScanner
 
 # Optional database library imports
 try:
@@ -21,97 +23,208 @@ class DatabaseChecker(BaseChecker):
         self.mysql_config = config.get('database', {}).get('mysql', {})
         self.postgresql_config = config.get(
             'database', {}).get('postgresql', {})
+        self.scanner = FileScanner.from_config(config, self.is_cancelled, self.track_workers)
+        self.pool = ConnectionPool()
+
+    def run_checks(self, local_only=False):
+        """Run all database security checks; local_only skips the live privilege audits"""
+        checks = [
+            (self.check_mysql_root_access,),
+            (self.check_postgresql_superuser_access,),
+            (self.check_database_passwords,),
+        ]
+        if not local_only:
+            checks += [
+                (self.check_mysql_privileges,),
+                (self.check_postgresql_privileges,),
+            ]
+
+        try:
+            return self.run_check_list(checks)
+        finally:
+            self.pool.close_all()
+
+    def _connect_mysql(self):
+        """Open a MySQL connection with the configured credentials"""
+        return pymysql.connect(
+            host=self.mysql_config.get('host', 'localhost'),
+            port=int(self.mysql_config.get('port', 3306)),
+            user=self.mysql_config['user'],
+            password=self.mysql_config.get('password', ''),
+            connect_timeout=max(1, int(self.network_timeout())))
+
+    def _connect_postgresql(self):
+        """Open a PostgreSQL connection with the configured credentials"""
+        return psycopg2.connect(
+            host=self.postgresql_config.get('host', 'localhost'),
+            port=int(self.postgresql_config.get('port', 5432)),
+            user=self.postgresql_config['user'],
+            password=self.postgresql_config.get('password', ''),
+            dbname=self.postgresql_config.get('database', 'postgres'),
+            connect_timeout=max(1, int(self.network_timeout())))
+
+    @reports("MySQL Remote Root Access", "MySQL Empty Passwords", "MySQL Broad Grants")
+    def check_mysql_privileges(self):
+        """Audit MySQL accounts over a live connection"""
+        if not self.mysql_config.get('user'):
+            return []
+        if not PYMYSQL_AVAILABLE:
+            return [self.create_result("MySQL Privilege Audit", False, "pymysql is not installed; live privilege checks skipped", "low")]
+
+        try:
+            server = ('mysql', self.mysql_config.get('host', 'localhost'), self.mysql_config.get('port', 3306))
+            rows = self.pool.run_queries(server, self._connect_mysql, [
+                ('accounts', "SELECT User, Host, plugin, "
+                             "(authentication_string = '' OR authentication_string IS NULL), "
+                             "Super_priv, Grant_priv, File_priv, Process_priv, Shutdown_priv "
+                             "FROM mysql.user")
+            ])
+        except Exception as e:
+            return [self.create_result("MySQL Privilege Audit", False, f"Error querying MySQL accounts: {str(e)}")]
+
+        local_hosts = ('localhost', '127.0.0.1', '::1')
+        socket_plugins = ('auth_socket', 'unix_socket')
+        system_users = ('root', 'mysql.sys', 'mysql.session', 'mysql.infoschema',
+                        'mariadb.sys', 'debian-sys-maint')
+
+        remote_root, empty_passwords, broad_grants = [], [], []
+        for user, host, plugin, empty_password, *privileges in rows['accounts']:
+            account = f"'{user}'@'{host}'"
+            if user == 'root' and host not in local_hosts:
+                remote_root.append(account)
+            if empty_password and plugin not in socket_plugins:
+                empty_passwords.append(account)
+            if user not in system_users and 'Y' in privileges:
+                broad_grants.append(account)
 
-    def run_checks(self):
-        """Run all database security checks"""
         results = []
+        if remote_root:
+            results.append(self.create_result("MySQL Remote Root Access", False, f"Root can log in remotely as: {', '.join(remote_root)}", "critical"))
+        else:
+            results.append(self.create_result("MySQL Remote Root Access", True, "Root is restricted to local connections"))
 
-        results.append(self.check_mysql_root_access())
-        results.append(self.check_postgresql_superuser_access())
-        results.append(self.check_database_passwords())
+        if empty_passwords:
+            results.append(self.create_result("MySQL Empty Passwords", False, f"Accounts without a password: {', '.join(empty_passwords)}", "critical"))
+        else:
+            results.append(self.create_result("MySQL Empty Passwords", True, "All password-authenticated accounts have a password"))
+
+        if broad_grants:
+            results.append(self.create_result("MySQL Broad Grants", False, f"Accounts with global administrative privileges: {', '.join(broad_grants)}", "high"))
+        else:
+            results.append(self.create_result("MySQL Broad Grants", True, "No application accounts hold global administrative privileges"))
 
         return results
 
+    @reports("PostgreSQL Superuser Roles", "PostgreSQL Broad Grants")
+    def check_postgresql_privileges(self):
+        """Audit PostgreSQL roles over a live connection"""
+        if not self.postgresql_config.get('user'):
+            return []
+        if not PSYCOPG2_AVAILABLE:
+            return [self.create_result("PostgreSQL Privilege Audit", False, "psycopg2 is not installed; live privilege checks skipped", "low")]
+
+        try:
+            server = ('postgresql', self.postgresql_config.get('host', 'localhost'), self.postgresql_config.get('port', 5432))
+            rows = self.pool.run_queries(server, self._connect_postgresql, [
+                ('roles', "SELECT rolname, rolsuper, rolcreaterole, rolbypassrls "
+                          "FROM pg_roles WHERE rolcanlogin AND rolname NOT LIKE 'pg\\_%'"),
+                ('public_grants', "SELECT DISTINCT table_schema || '.' || table_name "
+                                  "FROM information_schema.role_table_grants "
+                                  "WHERE grantee = 'PUBLIC' "
+                                  "AND table_schema NOT IN ('pg_catalog', 'information_schema') "
+                                  "ORDER BY 1")
+            ])
+        except Exception as e:
+            return [self.create_result("PostgreSQL Privilege Audit", False, f"Error querying PostgreSQL roles: {str(e)}")]
+
+        superusers = [name for name, rolsuper, _, _ in rows['roles']
+                      if rolsuper and name != 'postgres']
+        broad_roles = [name for name, rolsuper, createrole, bypassrls in rows['roles']
+                       if not rolsuper and (createrole or bypassrls)]
+        public_tables = [row[0] for row in rows['public_grants']]
+
+        results = []
+        if superusers:
+            results.append(self.create_result("PostgreSQL Superuser Roles", False, f"Login roles with superuser: {', '.join(superusers)}", "high"))
+        else:
+            results.append(self.create_result("PostgreSQL Superuser Roles", True, "Only the postgres role is a superuser"))
+
+        if broad_roles or public_tables:
+            details = []
+            if broad_roles:
+                details.append(f"roles with CREATEROLE/BYPASSRLS: {', '.join(broad_roles)}")
+            if public_tables:
+                details.append(f"tables granted to PUBLIC: {', '.join(public_tables[:5])}")
+            results.append(self.create_result("PostgreSQL Broad Grants", False, f"Overly broad grants found ({'; '.join(details)})", "medium"))
+        else:
+            results.append(self.create_result("PostgreSQL Broad Grants", True, "No overly broad role or table grants found"))
+
+        return results
+
+    @reports("MySQL Root Access")
     def check_mysql_root_access(self):
         """Check if application uses root MySQL access"""
         try:
             # Check if MySQL is running
-            stdout, stderr, returncode = self.run_command(
-                "systemctl is-active mysql || systemctl is-active mariadb")
-
-            if returncode != 0:
+            if not (self.facts.service_active('mysql', 'mysqld') or
+                    self.facts.service_active('mariadb', 'mariadbd')):
                 return self.create_result("MySQL Root Access", True, "MySQL/MariaDB is not running")
 
             # Check for root user in application configs
             web_roots = ['/var/www', '/var/www/html', '/usr/share/nginx/html']
-            root_usage_found = []
-
-            for root in web_roots:
-                stdout, stderr, returncode = self.run_command(
-                    f"find {root} -type f -name '*.php' -o -name '*.py' -o -name '*.js' -o -name '.env' 2>/dev/null | xargs grep -l 'root.*password' 2>/dev/null")
-                if stdout.strip():
-                    root_usage_found.extend(stdout.strip().split('\n'))
+            root_usage_found, details = self.facts.scan(
+                self.scanner, 'grep_files', web_roots, [(['*.php', '*.py', '*.js', '.env'], 'root.*password')])
 
             if root_usage_found:
-                return self.create_result("MySQL Root Access", False, f"Potential root database usage found in: {', '.join(root_usage_found[:3])}")
+                return self.create_result("MySQL Root Access", False, f"Potential root database usage found in: {', '.join(root_usage_found[:3])}", details=details)
+            elif not self.scanner.complete:
+                return self.create_result("MySQL Root Access", False, self.scanner.pause_message(), "low", details=details)
             else:
-                return self.create_result("MySQL Root Access", True, "No obvious root database usage found in application files")
+                return self.create_result("MySQL Root Access", True, "No obvious root database usage found in application files", details=details)
 
         except Exception as e:
             return self.create_result("MySQL Root Access", False, f"Error checking MySQL root access: {str(e)}")
 
+    @reports("PostgreSQL Superuser Access")
     def check_postgresql_superuser_access(self):
         """Check if application uses PostgreSQL superuser access"""
         try:
             # Check if PostgreSQL is running
-            stdout, stderr, returncode = self.run_command(
-                "systemctl is-active postgresql")
-
-            if returncode != 0:
+            if not self.facts.service_active('postgresql', 'postgres'):
                 return self.create_result("PostgreSQL Superuser Access", True, "PostgreSQL is not running")
 
             # Check for postgres/superuser usage in configs
             web_roots = ['/var/www', '/var/www/html', '/usr/share/nginx/html']
-            superuser_usage_found = []
-
-            for root in web_roots:
-                stdout, stderr, returncode = self.run_command(
-                    f"find {root} -type f -name '*.py' -o -name '*.js' -o -name '.env' 2>/dev/null | xargs grep -l 'postgres.*password\\|superuser' 2>/dev/null")
-                if stdout.strip():
-                    superuser_usage_found.extend(stdout.strip().split('\n'))
+            superuser_usage_found, details = self.facts.scan(
+                self.scanner, 'grep_files', web_roots, [(['*.py', '*.js', '.env'], 'postgres.*password|superuser')])
 
             if superuser_usage_found:
-                return self.create_result("PostgreSQL Superuser Access", False, f"Potential superuser database usage found")
+                return self.create_result("PostgreSQL Superuser Access", False, f"Potential superuser database usage found", details=details)
+            elif not self.scanner.complete:
+                return self.create_result("PostgreSQL Superuser Access", False, self.scanner.pause_message(), "low", details=details)
             else:
-                return self.create_result("PostgreSQL Superuser Access", True, "No obvious superuser database usage found")
+                return self.create_result("PostgreSQL Superuser Access", True, "No obvious superuser database usage found", details=details)
 
         except Exception as e:
             return self.create_result("PostgreSQL Superuser Access", False, f"Error checking PostgreSQL superuser access: {str(e)}")
 
+    @reports("Database Password Strength")
     def check_database_passwords(self):
         """Check for strong database passwords in configuration"""
         try:
             weak_patterns = ['password', '123456', 'admin', 'root', 'test', '']
             config_files = ['.env', 'config.php',
                             'settings.py', 'database.yml']
-            weak_passwords_found = []
-
-            for config_file in config_files:
-                stdout, stderr, returncode = self.run_command(
-                    f"find /var/www /usr/share/nginx/html -name '{config_file}' 2>/dev/null")
-                if stdout.strip():
-                    for file_path in stdout.strip().split('\n'):
-                        for pattern in weak_patterns:
-                            stdout2, stderr2, returncode2 = self.run_command(
-                                f"grep -i 'password.*{pattern}' {file_path} 2>/dev/null")
-                            if stdout2.strip():
-                                weak_passwords_found.append(file_path)
-                                break
+            weak_passwords_found, details = self.facts.scan(
+                self.scanner, 'grep_files', ['/var/www', '/usr/share/nginx/html'],
+                [(config_files, f'password.*{pattern}') for pattern in weak_patterns], True)
 
             if weak_passwords_found:
-                return self.create_result("Database Password Strength", False, f"Weak database passwords found in: {', '.join(weak_passwords_found)}")
+                return self.create_result("Database Password Strength", False, f"Weak database passwords found in: {', '.join(weak_passwords_found)}", details=details)
+            elif not self.scanner.complete:
+                return self.create_result("Database Password Strength", False, self.scanner.pause_message(), "low", details=details)
             else:
-                return self.create_result("Database Password Strength", True, "No obvious weak database passwords found")
+                return self.create_result("Database Password Strength", True, "No obvious weak database passwords found", details=details)
 
         except Exception as e:
             return self.create_result("Database Password Strength", False, f"Error checking database passwords: {str(e)}")
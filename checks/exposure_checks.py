@@ -0,0 +1,48 @@
+from .base_checker import BaseChecker, reports
+from utils.http_prober import HTTPProber
+
+
+class ExposureChecker(BaseChecker):
+    def __init__(self, config):
+        super().__init__(config)
+        self.target_urls = config.get('web_server', {}).get(
+            'target_urls', ['http://localhost'])
+        exposure_config = config.get('exposure', {})
+        self.request_timeout = exposure_config.get('timeout', 5)
+        self.prober = HTTPProber(
+            exposure_config.get('paths', []),
+            max_workers=exposure_config.get('max_workers', 8),
+            requests_per_second=exposure_config.get('requests_per_second', 5),
+            timeout=self.request_timeout)
+
+    def run_checks(self, target_host=None):
+        """Run all HTTP exposure checks"""
+        if target_host:
+            self.target_urls = [
+                f"http://{target_host}", f"https://{target_host}"]
+
+        return self.run_check_list([
+            (self.check_exposed_paths,),
+        ])
+
+    @reports("Sensitive Path Exposure",
+             targets=lambda checker: [url.rstrip('/') for url in checker.target_urls])
+    def check_exposed_paths(self):
+        """Probe every target URL for the sensitive path wordlist"""
+        try:
+            self.prober.timeout = min(self.request_timeout, self.network_timeout())
+            exposed, unreachable = self.prober.probe(self.target_urls, self.cancellation_flag())
+        except Exception as e:
+            return [self.create_result("Sensitive Path Exposure", False, f"Error probing sensitive paths: {str(e)}")]
+
+        return [self.check_sensitive_paths(url, paths, unreachable.get(url)) for url, paths in exposed.items()]
+
+    def check_sensitive_paths(self, url, paths, error=None):
+        """Report sensitive files reachable over HTTP for one base URL"""
+        if error:
+            return self.create_result("Sensitive Path Exposure", False, f"Could not reach {url}: {error['error']}", "low", target=url, details=error)
+        if not paths:
+            return self.create_result("Sensitive Path Exposure", True, f"No sensitive paths reachable on {url}", target=url)
+
+        severity = "critical" if any(path.startswith(('/.git', '/.env')) for path in paths) else "high"
+        return self.create_result("Sensitive Path Exposure", False, f"Sensitive paths reachable on {url}: {', '.join(paths)}", severity, target=url)
@@ -1,7 +1,5 @@
-import subprocess
 import re
-import os
-from .base_checker import BaseChecker
+from .base_checker import BaseChecker, reports
 
 
 class SSHSecurityChecker(BaseChecker):
@@ -11,21 +9,18 @@ class SSHSecurityChecker(BaseChecker):
 
     def run_checks(self, target_host=None):
         """Run all SSH security checks"""
-        results = []
-
-        results.append(self.check_password_auth_disabled())
-        results.append(self.check_root_login_disabled())
-        results.append(self.check_authorized_keys())
-
-        return results
+        return self.run_check_list([
+            (self.check_password_auth_disabled,),
+            (self.check_root_login_disabled,),
+            (self.check_authorized_keys,),
+        ])
 
+    @reports("SSH Password Authentication")
     def check_password_auth_disabled(self):
         """Check if password authentication is disabled"""
         try:
-            if os.path.exists(self.ssh_config_path):
-                with open(self.ssh_config_path, 'r') as f:
-                    content = f.read()
-
+            content = self.facts.read_file(self.ssh_config_path)
+            if content is not None:
                 # Check for PasswordAuthentication no
                 if re.search(r'^\s*PasswordAuthentication\s+no', content, re.MULTILINE):
                     return self.create_result("SSH Password Authentication", True, "Password authentication is disabled")
@@ -36,13 +31,12 @@ class SSHSecurityChecker(BaseChecker):
         except Exception as e:
             return self.create_result("SSH Password Authentication", False, f"Error checking SSH config: {str(e)}")
 
+    @reports("SSH Root Login")
     def check_root_login_disabled(self):
         """Check if root login is disabled"""
         try:
-            if os.path.exists(self.ssh_config_path):
-                with open(self.ssh_config_path, 'r') as f:
-                    content = f.read()
-
+            content = self.facts.read_file(self.ssh_config_path)
+            if content is not None:
                 if re.search(r'^\s*PermitRootLogin\s+no', content, re.MULTILINE):
                     return self.create_result("SSH Root Login", True, "Root login is disabled")
                 else:
@@ -52,6 +46,7 @@ class SSHSecurityChecker(BaseChecker):
         except Exception as e:
             return self.create_result("SSH Root Login", False, f"Error checking SSH config: {str(e)}")
 
+    @reports("Authorized SSH Keys")
     def check_authorized_keys(self):
         """Check if only authorized keys are present"""
         try:
@@ -60,10 +55,8 @@ class SSHSecurityChecker(BaseChecker):
 
             # Check root authorized keys
             root_keys_path = "/root/.ssh/authorized_keys"
-            if os.path.exists(root_keys_path):
-                with open(root_keys_path, 'r') as f:
-                    keys_content = f.read()
-
+            keys_content = self.facts.read_file(root_keys_path)
+            if keys_content is not None:
                 # Basic check - this would need to be enhanced for production
                 if any(key in keys_content for key in authorized_keys):
                     return self.create_result("Authorized SSH Keys", True, "Authorized keys found")
@@ -1,8 +1,36 @@
 import ssl
 import socket
-import subprocess
-from datetime import datetime
-from .base_checker import BaseChecker
+from concurrent.futures import ThreadPoolExecutor
+from .base_checker import BaseChecker, CheckCancelled, reports
+from utils.x509 import certificate_days_left, parse_certificate
+
+
+PROTOCOL_VERSIONS = {
+    'TLSv1': ssl.TLSVersion.TLSv1,
+    'TLSv1.1': ssl.TLSVersion.TLSv1_1,
+    'TLSv1.2': ssl.TLSVersion.TLSv1_2,
+    'TLSv1.3': ssl.TLSVersion.TLSv1_3,
+}
+
+# OpenSSL cipher strings for suites that cap or fail the grade
+WEAK_CIPHER_SUITES = {
+    'NULL': 'eNULL',
+    'EXPORT': 'EXP',
+    'anonymous': 'aNULL',
+    'RC4': 'RC4',
+    '3DES': '3DES',
+}
+
+# Handshake errors raised by the local OpenSSL before the server is involved
+CLIENT_SIDE_ERRORS = {'NO_PROTOCOLS_AVAILABLE', 'NO_CIPHERS_AVAILABLE', 'NO_CIPHER_MATCH'}
+
+GRADE_ORDER = ['A+', 'A', 'B', 'C', 'F']
+
+HSTS_MIN_MAX_AGE = 15768000
+
+
+class TLSProbeError(Exception):
+    """A domain's TLS probe failed; the message is the one the probe raised"""
 
 
 class SSLChecker(BaseChecker):
@@ -12,52 +40,296 @@ class SSLChecker(BaseChecker):
 
     def run_checks(self):
         """Run all SSL security checks"""
-        results = []
+        checks = []
 
         for domain in self.domains:
-            results.append(self.check_ssl_grade(domain))
-            results.append(self.check_ssl_certificate_expiry(domain))
+            checks.append((self.check_ssl_grade, domain))
+            checks.append((self.check_ssl_certificate_expiry, domain))
+
+        return self.run_check_list(checks)
+
+    @staticmethod
+    def _split_domain(domain):
+        """Split 'host[:port]' into host and port, defaulting to 443"""
+        host, _, port = domain.partition(':')
+        return host, int(port) if port else 443
+
+    @staticmethod
+    def _probe_context(version=None, ciphers='ALL:@SECLEVEL=0'):
+        """Build a non-verifying client context pinned to one protocol version"""
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        if version is not None:
+            context.minimum_version = version
+            context.maximum_version = version
+        context.set_ciphers(ciphers)
+        return context
+
+    def _handshake(self, domain, context, timeout):
+        """Complete one handshake and return (protocol, cipher, DER cert)"""
+        host, port = self._split_domain(domain)
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            with context.wrap_socket(sock, server_hostname=host) as ssock:
+                return ssock.version(), ssock.cipher(), ssock.getpeercert(binary_form=True)
+
+    def _try_handshake(self, domain, context_factory, timeout):
+        """Return (protocol, cipher, DER cert) if the server completes a handshake
+
+        Returns False if the server refuses it, or None if the local OpenSSL
+        cannot offer the protocol or cipher suites at all, so nothing was tested.
+        """
+        try:
+            context = context_factory()
+        except (ssl.SSLError, ValueError):
+            return None
+        try:
+            return self._handshake(domain, context, timeout)
+        except ssl.SSLError as e:
+            return None if e.reason in CLIENT_SIDE_ERRORS else False
+        except OSError:
+            return False
+
+    def _accepts(self, domain, context_factory, timeout):
+        """True, False or None as _try_handshake, without the handshake details"""
+        outcome = self._try_handshake(domain, context_factory, timeout)
+        return True if outcome else outcome
+
+    def _verify_chain(self, domain, timeout):
+        """Handshake with full verification and return the failure, if any
+
+        A handshake that fails before the certificate is checked, such as on
+        a server without TLS 1.2, leaves the chain unknown: code is None.
+        """
+        host, port = self._split_domain(domain)
+        try:
+            with socket.create_connection((host, port), timeout=timeout) as sock:
+                with ssl.create_default_context().wrap_socket(sock, server_hostname=host):
+                    return None
+        except ssl.SSLCertVerificationError as e:
+            return {"code": e.verify_code, "message": e.verify_message}
+        except (ssl.SSLError, OSError) as e:
+            return {"code": None, "message": str(e)}
+
+    def _hsts_max_age(self, domain, timeout):
+        """Read the Strict-Transport-Security max-age from the site root"""
+        host, port = self._split_domain(domain)
+        try:
+            with socket.create_connection((host, port), timeout=timeout) as sock:
+                with self._probe_context(ciphers='DEFAULT').wrap_socket(sock, server_hostname=host) as ssock:
+                    ssock.sendall(f"HEAD / HTTP/1.1\r\nHost: {domain}\r\nConnection: close\r\n\r\n".encode())
+                    response = b''
+                    while b'\r\n\r\n' not in response and len(response) < 65536:
+                        chunk = ssock.recv(4096)
+                        if not chunk:
+                            break
+                        response += chunk
+        except (ssl.SSLError, OSError):
+            return None
+
+        for line in response.split(b'\r\n\r\n')[0].decode('latin-1').split('\r\n')[1:]:
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'strict-transport-security':
+                for directive in value.split(';'):
+                    key, _, number = directive.strip().partition('=')
+                    if key.lower() == 'max-age' and number.strip('"').isdigit():
+                        return int(number.strip('"'))
+        return None
+
+    @staticmethod
+    def _run_probes(probes, is_cancelled=lambda: False):
+        """Run named probe callables concurrently and return their outcomes
+
+        Probes still queued when the check is cancelled raise CheckCancelled
+        instead of opening another handshake.
+        """
+        def guarded(probe):
+            if is_cancelled():
+                raise CheckCancelled("TLS probe cancelled")
+            return probe()
+
+        if not probes:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+            futures = {name: pool.submit(guarded, probe) for name, probe in probes.items()}
+            return {name: future.result() for name, future in futures.items()}
 
-        return results
+    def probe_tls(self, domain):
+        """Run all grading handshakes for a domain concurrently
 
+        Weak cipher classes are probed on every enabled protocol below TLS 1.3
+        (TLS 1.3 has no weak suites), once the enabled protocols are known.
+        The certificate and negotiated suite come from the handshake on the
+        highest protocol the server accepted, so servers limited to TLS 1.0/1.1
+        are graded rather than failing a default handshake.
+        """
+        timeout = self.network_timeout()
+        is_cancelled = self.cancellation_flag()
+        probes = {
+            'chain_error': lambda: self._verify_chain(domain, timeout),
+            'hsts_max_age': lambda: self._hsts_max_age(domain, timeout),
+        }
+        for name, version in PROTOCOL_VERSIONS.items():
+            probes[name] = (
+                lambda version=version: self._try_handshake(domain, lambda: self._probe_context(version), timeout))
+        outcomes = self._run_probes(probes, is_cancelled)
+        handshakes = {name: outcomes[name] for name in PROTOCOL_VERSIONS}
+        protocols = {name: True if handshake else handshake for name, handshake in handshakes.items()}
+
+        accepted = [handshake for handshake in handshakes.values() if handshake]
+        if accepted:
+            protocol, cipher, der = accepted[-1]
+        else:
+            # Nothing was accepted; repeat a default handshake to raise its error
+            protocol, cipher, der = self._handshake(domain, self._probe_context(ciphers='DEFAULT'), timeout)
+
+        enabled = [name for name, accepted in protocols.items() if accepted and name != 'TLSv1.3']
+        cipher_probes = {}
+        for name, cipher_string in WEAK_CIPHER_SUITES.items():
+            for protocol_name in enabled:
+                cipher_probes[name, protocol_name] = (
+                    lambda cipher_string=cipher_string, version=PROTOCOL_VERSIONS[protocol_name]:
+                    self._accepts(domain, lambda: self._probe_context(version, f'{cipher_string}:@SECLEVEL=0'), timeout))
+        cipher_outcomes = self._run_probes(cipher_probes, is_cancelled)
+
+        weak_ciphers, untested_ciphers = [], []
+        for name in WEAK_CIPHER_SUITES:
+            accepted = [cipher_outcomes[name, protocol_name] for protocol_name in enabled]
+            if True in accepted:
+                weak_ciphers.append(name)
+            elif None in accepted:
+                untested_ciphers.append(name)
+
+        return {
+            "domain": domain,
+            "negotiated_protocol": protocol,
+            "negotiated_cipher": cipher[0],
+            "certificate": parse_certificate(der),
+            "chain_error": outcomes['chain_error'],
+            "hsts_max_age": outcomes['hsts_max_age'],
+            "protocols": {name: bool(accepted) for name, accepted in protocols.items()},
+            "untested_protocols": [name for name, accepted in protocols.items() if accepted is None],
+            "weak_ciphers": weak_ciphers,
+            "untested_ciphers": untested_ciphers,
+        }
+
+    def _collect_tls(self, domain):
+        """probe_tls, with a failed probe recorded as {"error": message}"""
+        try:
+            return self.probe_tls(domain)
+        except CheckCancelled:
+            raise
+        except Exception as e:
+            return {"error": str(e)}
+
+    def tls_facts(self, domain):
+        """Probe results for a domain, probed once per run or read from a snapshot
+
+        A failed probe is cached as well, so evaluating a snapshot reports the
+        same error the live run did.
+        """
+        facts = self.facts.get('tls', domain, lambda: self._collect_tls(domain))
+        if 'error' in facts:
+            raise TLSProbeError(facts['error'])
+        return facts
+
+    @staticmethod
+    def grade_tls(facts):
+        """Compute an A+ to F grade and the reasons for any cap
+
+        Protocols and cipher classes the local OpenSSL could not offer, and a
+        chain that could not be verified, are listed in the reasons; they do
+        not change the grade.
+        """
+        caps = []
+
+        def cap(grade, reason):
+            caps.append((grade, reason))
+
+        certificate = facts['certificate']
+        key_size = certificate['key_size']
+        if certificate['key_type'] == 'RSA' and key_size < 1024:
+            cap('F', f"RSA key is only {key_size} bits")
+        elif certificate['key_type'] == 'RSA' and key_size < 2048:
+            cap('B', f"RSA key is only {key_size} bits")
+        elif certificate['key_type'] == 'EC' and key_size < 256:
+            cap('B', f"EC key is only {key_size} bits")
+
+        signature = certificate['signature_algorithm'].lower()
+        if 'md5' in signature:
+            cap('F', "certificate is signed with MD5")
+        elif 'sha1' in signature:
+            cap('C', "certificate is signed with SHA-1")
+
+        chain_error = facts['chain_error']
+        unverified_chain = None
+        if chain_error:
+            if chain_error['code'] is None:
+                unverified_chain = f"certificate chain could not be verified ({chain_error['message']})"
+            elif chain_error['code'] == 20:
+                cap('B', "certificate chain is incomplete")
+            else:
+                cap('F', f"certificate is not trusted ({chain_error['message']})")
+
+        protocols = facts['protocols']
+        if protocols.get('TLSv1') or protocols.get('TLSv1.1'):
+            cap('B', "TLS 1.0/1.1 is enabled")
+        if not protocols.get('TLSv1.2') and not protocols.get('TLSv1.3'):
+            cap('C', "neither TLS 1.2 nor TLS 1.3 is supported")
+
+        for name in facts['weak_ciphers']:
+            if name in ('NULL', 'EXPORT', 'anonymous'):
+                cap('F', f"{name} cipher suites are accepted")
+            else:
+                cap('C', f"{name} cipher suites are accepted")
+
+        cipher = facts['negotiated_cipher']
+        if facts['negotiated_protocol'] != 'TLSv1.3' and 'DHE' not in cipher:
+            cap('B', "preferred cipher suite lacks forward secrecy")
+
+        grade = 'A'
+        for capped_grade, _ in caps:
+            if GRADE_ORDER.index(capped_grade) > GRADE_ORDER.index(grade):
+                grade = capped_grade
+        if grade == 'A' and (facts['hsts_max_age'] or 0) >= HSTS_MIN_MAX_AGE:
+            grade = 'A+'
+
+        reasons = [reason for _, reason in caps]
+        if unverified_chain:
+            reasons.append(unverified_chain)
+        for name in facts.get('untested_protocols', []):
+            reasons.append(f"{name} could not be tested with the local OpenSSL")
+        untested_ciphers = facts.get('untested_ciphers', [])
+        if untested_ciphers:
+            reasons.append(f"{', '.join(untested_ciphers)} cipher suites could not be tested with the local OpenSSL")
+        return grade, reasons
+
+    @reports("SSL Certificate Grade")
     def check_ssl_grade(self, domain):
-        """Check SSL certificate grade using SSL Labs API or testssl.sh"""
+        """Grade the TLS configuration with concurrent in-process handshakes"""
         try:
-            # Using testssl.sh for local testing (if available)
-            stdout, stderr, returncode = self.run_command(
-                f"testssl.sh --grade-only {domain}")
+            grade, reasons = self.grade_tls(self.tls_facts(domain))
 
-            if returncode == 0 and 'A' in stdout:
-                return self.create_result("SSL Certificate Grade", True, f"SSL grade appears to be A or better for {domain}")
+            if grade in ('A+', 'A'):
+                notes = f" ({'; '.join(reasons)})" if reasons else ""
+                return self.create_result("SSL Certificate Grade", True, f"SSL grade {grade} for {domain}{notes}", target=domain)
             else:
-                # Fallback to basic SSL connection test
-                context = ssl.create_default_context()
-                with socket.create_connection((domain, 443), timeout=10) as sock:
-                    with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                        cipher = ssock.cipher()
-                        if cipher and cipher[1] in ['TLSv1.2', 'TLSv1.3']:
-                            return self.create_result("SSL Certificate Grade", True, f"Strong TLS version detected for {domain}")
-                        else:
-                            return self.create_result("SSL Certificate Grade", False, f"Weak TLS configuration for {domain}")
+                severity = "high" if grade == 'F' else "medium"
+                return self.create_result("SSL Certificate Grade", False, f"SSL grade {grade} for {domain}: {'; '.join(reasons)}", severity, target=domain)
         except Exception as e:
-            return self.create_result("SSL Certificate Grade", False, f"Error checking SSL grade for {domain}: {str(e)}")
+            return self.create_result("SSL Certificate Grade", False, f"Error checking SSL grade for {domain}: {str(e)}", target=domain)
 
+    @reports("SSL Certificate Expiry")
     def check_ssl_certificate_expiry(self, domain):
         """Check SSL certificate expiration"""
         try:
-            context = ssl.create_default_context()
-            with socket.create_connection((domain, 443), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
-                    expiry_date = datetime.strptime(
-                        cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
-                    days_until_expiry = (expiry_date - datetime.now()).days
-
-                    if days_until_expiry > 30:
-                        return self.create_result("SSL Certificate Expiry", True, f"Certificate valid for {days_until_expiry} days")
-                    elif days_until_expiry > 0:
-                        return self.create_result("SSL Certificate Expiry", False, f"Certificate expires in {days_until_expiry} days", "high")
-                    else:
-                        return self.create_result("SSL Certificate Expiry", False, "Certificate has expired", "critical")
+            days_until_expiry = certificate_days_left(self.tls_facts(domain)['certificate'])
+
+            if days_until_expiry > 30:
+                return self.create_result("SSL Certificate Expiry", True, f"Certificate valid for {days_until_expiry} days", target=domain, details={"days_until_expiry": days_until_expiry})
+            elif days_until_expiry > 0:
+                return self.create_result("SSL Certificate Expiry", False, f"Certificate expires in {days_until_expiry} days", "high", target=domain, details={"days_until_expiry": days_until_expiry})
+            else:
+                return self.create_result("SSL Certificate Expiry", False, "Certificate has expired", "critical", target=domain, details={"days_until_expiry": days_until_expiry})
         except Exception as e:
-            return self.create_result("SSL Certificate Expiry", False, f"Error checking certificate expiry for {domain}: {str(e)}")
+            return self.create_result("SSL Certificate Expiry", False, f"Error checking certificate expiry for {domain}: {str(e)}", target=domain)
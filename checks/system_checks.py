@@ -1,63 +1,56 @@
-import os
-import subprocess
-from .base_checker import BaseChecker
+from .base_checker import BaseChecker, reports
+from utils.file_scanner import FileScanner
 
 
 class SystemSecurityChecker(BaseChecker):
     def __init__(self, config):
         super().__init__(config)
-
-    def run_checks(self):
-        """Run all system security checks"""
-        results = []
-
-        results.append(self.check_fail2ban_installed())
-        results.append(self.check_clamav_installed())
-        results.append(self.check_open_ports())
-        results.append(self.check_file_permissions())
-        results.append(self.check_git_directory_access())
-
-        return results
-
+        self.scanner = FileScanner.from_config(config, self.is_cancelled, self.track_workers)
+
+    def run_checks(self, quick=False):
+        """Run all system security checks; quick skips the web root walk"""
+        checks = [
+            (self.check_fail2ban_installed,),
+            (self.check_clamav_installed,),
+            (self.check_open_ports,),
+            (self.check_file_permissions,),
+        ]
+        if not quick:
+            checks.append((self.check_git_directory_access,))
+
+        return self.run_check_list(checks)
+
+    @reports("Fail2ban Protection")
     def check_fail2ban_installed(self):
         """Check if fail2ban is installed and running"""
         try:
-            stdout, stderr, returncode = self.run_command(
-                "systemctl is-active fail2ban")
-
-            if returncode == 0 and 'active' in stdout:
+            if self.facts.service_active('fail2ban', 'fail2ban-server'):
                 return self.create_result("Fail2ban Protection", True, "Fail2ban is installed and active")
             else:
                 return self.create_result("Fail2ban Protection", False, "Fail2ban is not active or not installed")
         except Exception as e:
             return self.create_result("Fail2ban Protection", False, f"Error checking fail2ban: {str(e)}")
 
+    @reports("ClamAV Antivirus")
     def check_clamav_installed(self):
         """Check if ClamAV is installed"""
         try:
-            stdout, stderr, returncode = self.run_command("which clamscan")
-
-            if returncode == 0:
+            if self.facts.which('clamscan'):
                 return self.create_result("ClamAV Antivirus", True, "ClamAV is installed")
             else:
                 return self.create_result("ClamAV Antivirus", False, "ClamAV is not installed")
         except Exception as e:
             return self.create_result("ClamAV Antivirus", False, f"Error checking ClamAV: {str(e)}")
 
+    @reports("Open Ports Check")
     def check_open_ports(self):
         """Check for unnecessary open ports"""
         try:
-            stdout, stderr, returncode = self.run_command(
-                "netstat -tuln | grep LISTEN")
+            listeners = self.facts.listeners()
 
-            if returncode == 0:
-                lines = stdout.strip().split('\n')
-                public_ports = []
-
-                for line in lines:
-                    if '0.0.0.0:' in line:
-                        port = line.split('0.0.0.0:')[1].split()[0]
-                        public_ports.append(port)
+            if listeners is not None:
+                public_ports = sorted({str(port) for address, port in listeners
+                                       if address in ('0.0.0.0', '::')}, key=int)
 
                 # Common necessary ports
                 necessary_ports = ['22', '80', '443']
@@ -73,6 +66,7 @@ class SystemSecurityChecker(BaseChecker):
         except Exception as e:
             return self.create_result("Open Ports Check", False, f"Error checking open ports: {str(e)}")
 
+    @reports("File Permissions")
     def check_file_permissions(self):
         """Check critical file permissions"""
         try:
@@ -84,8 +78,9 @@ class SystemSecurityChecker(BaseChecker):
 
             issues = []
             for file_path, expected_perm in critical_files:
-                if os.path.exists(file_path):
-                    actual_perm = oct(os.stat(file_path).st_mode)[-3:]
+                file_stat = self.facts.stat(file_path)
+                if file_stat is not None:
+                    actual_perm = oct(file_stat['mode'])[-3:]
                     if actual_perm != expected_perm:
                         issues.append(
                             f"{file_path}: {actual_perm} (expected {expected_perm})")
@@ -97,22 +92,18 @@ class SystemSecurityChecker(BaseChecker):
         except Exception as e:
             return self.create_result("File Permissions", False, f"Error checking file permissions: {str(e)}")
 
+    @reports("Git Directory Protection")
     def check_git_directory_access(self):
         """Check if .git directories are publicly accessible"""
         try:
             # This would need to be enhanced to check web-accessible directories
             web_roots = ['/var/www', '/var/www/html', '/usr/share/nginx/html']
-            git_dirs_found = []
-
-            for root in web_roots:
-                if os.path.exists(root):
-                    stdout, stderr, returncode = self.run_command(
-                        f"find {root} -type d -name '.git' 2>/dev/null")
-                    if stdout.strip():
-                        git_dirs_found.extend(stdout.strip().split('\n'))
+            git_dirs_found, _ = self.facts.scan(self.scanner, 'find_files', web_roots, ['.git'], 'd')
 
             if git_dirs_found:
                 return self.create_result("Git Directory Protection", False, f"Git directories found in web roots: {', '.join(git_dirs_found)}")
+            elif not self.scanner.complete:
+                return self.create_result("Git Directory Protection", False, self.scanner.pause_message(), "low")
             else:
                 return self.create_result("Git Directory Protection", True, "No git directories found in web-accessible locations")
         except Exception as e:
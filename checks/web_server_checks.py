@@ -1,85 +1,213 @@
 import requests
 import subprocess
-from .base_checker import BaseChecker
+from .base_checker import BaseChecker, reports
+from utils.host_facts import CollectionFailed
+from utils.x509 import certificate_days_left
+
+
+def _virtual_host_target(checker, virtual_host, *args):
+    """Target of a result about a parsed virtual host"""
+    return [virtual_host['target']]
 
 
 class WebServerChecker(BaseChecker):
     def __init__(self, config):
         super().__init__(config)
-        self.target_urls = config.get('web_server', {}).get(
-            'target_urls', ['http://localhost'])
-
-    def run_checks(self, target_host=None):
-        """Run all web server security checks"""
+        web_config = config.get('web_server', {})
+        self.target_urls = web_config.get('target_urls', ['http://localhost'])
+        self.analyze_config = web_config.get('analyze_config', True)
+        self.server_configs = web_config.get('server_configs', {})
+
+    def run_checks(self, target_host=None, local_only=False):
+        """Run all web server security checks
+
+        Local runs evaluate the nginx/Apache configuration directly when one
+        is found; remote hosts and hosts without a readable config are
+        checked over HTTP against target_urls, unless local_only is set.
+        """
+        checks = []
         results = []
 
         if target_host:
             self.target_urls = [
                 f"http://{target_host}", f"https://{target_host}"]
+        elif self.analyze_config:
+            try:
+                virtual_hosts = self.facts.virtual_hosts(self.server_configs)
+            except CollectionFailed as e:
+                virtual_hosts = []
+                results.append(self.create_result("Web Server Config", False, f"Could not parse web server config: {str(e)}", "low"))
+            if virtual_hosts:
+                return results + self.run_check_list(self._config_checks(virtual_hosts))
+        if local_only:
+            return results
 
         for url in self.target_urls:
-            results.append(self.check_server_version_hidden(url))
-            results.append(self.check_platform_version_hidden(url))
-            results.append(self.check_https_redirect(url))
-            results.append(self.check_https_only(url))
+            checks.append((self.check_server_version_hidden, url))
+            checks.append((self.check_platform_version_hidden, url))
+            checks.append((self.check_https_redirect, url))
+            checks.append((self.check_https_only, url))
+
+        return results + self.run_check_list(checks)
+
+    def _config_checks(self, virtual_hosts):
+        """(check, *args) tuples evaluating parsed virtual hosts"""
+        checks = []
+        certificates = []
+        for virtual_host in virtual_hosts:
+            checks.append((self.check_config_version_hidden, virtual_host))
+            checks.append((self.check_config_platform_version_hidden, virtual_host))
+            if virtual_host['plain_ports']:
+                checks.append((self.check_config_https_redirect, virtual_host))
+                checks.append((self.check_config_https_available, virtual_host, virtual_hosts))
+            certificates += [path for path in virtual_host['certificates'] if path not in certificates]
+
+        for path in certificates:
+            checks.append((self.check_certificate_file_expiry, path))
+        return checks
+
+    @staticmethod
+    def _config_details(virtual_host):
+        """Where a virtual host is defined, for result details"""
+        return {"server": virtual_host['server'], "file": virtual_host['file'], "line": virtual_host['line']}
+
+    @reports("Web Server Version Hidden", targets=_virtual_host_target)
+    def check_config_version_hidden(self, virtual_host):
+        """Check server_tokens / ServerTokens hide the server version"""
+        target = virtual_host['target']
+        details = self._config_details(virtual_host)
+        tokens = str(virtual_host['server_tokens'])
+
+        if virtual_host['server'] == 'nginx':
+            hidden = tokens.lower() == 'off'
+            directive = f"server_tokens {tokens}"
+        else:
+            hidden = tokens.lower() in ('prod', 'productonly')
+            directive = f"ServerTokens {tokens}"
+
+        if hidden:
+            return self.create_result("Web Server Version Hidden", True, f"Server version is hidden ({directive})", target=target, details=details)
+        else:
+            return self.create_result("Web Server Version Hidden", False, f"Server version exposed: {directive}", target=target, details=details)
+
+    @reports("Platform Version Hidden", targets=_virtual_host_target)
+    def check_config_platform_version_hidden(self, virtual_host):
+        """Check X-Powered-By is removed where requests reach an application"""
+        target = virtual_host['target']
+        details = self._config_details(virtual_host)
+
+        if not virtual_host['backend']:
+            return self.create_result("Platform Version Hidden", True, "No application backend is configured", target=target, details=details)
+        elif virtual_host['hides_powered_by']:
+            return self.create_result("Platform Version Hidden", True, "X-Powered-By is removed from backend responses", target=target, details=details)
+        else:
+            return self.create_result("Platform Version Hidden", False, "Backend responses may expose the platform version in X-Powered-By", "low", target=target, details=details)
+
+    @reports("HTTPS Redirect", targets=_virtual_host_target)
+    def check_config_https_redirect(self, virtual_host):
+        """Check a plain HTTP virtual host redirects to HTTPS"""
+        target = virtual_host['target']
+        details = self._config_details(virtual_host)
+
+        if virtual_host['redirects_to_https']:
+            return self.create_result("HTTPS Redirect", True, "HTTP properly redirects to HTTPS", target=target, details=details)
+        else:
+            return self.create_result("HTTPS Redirect", False, "HTTP does not redirect to HTTPS", target=target, details=details)
+
+    @reports("HTTPS Available", targets=_virtual_host_target)
+    def check_config_https_available(self, virtual_host, virtual_hosts):
+        """Check the names of a plain HTTP virtual host are also served over HTTPS"""
+        target = virtual_host['target']
+        details = self._config_details(virtual_host)
+        tls_hosts = [other for other in virtual_hosts
+                     if other['tls'] and other['server'] == virtual_host['server']]
+        names = set(virtual_host['names'])
+        tls_names = {name for other in tls_hosts for name in other['names']}
+
+        if virtual_host['tls'] or (tls_hosts and (not names or names & tls_names)):
+            return self.create_result("HTTPS Available", True, "Application is configured for HTTPS", target=target, details=details)
+        else:
+            return self.create_result("HTTPS Available", False, "No HTTPS virtual host serves this site", target=target, details=details)
+
+    @reports("Certificate File Expiry")
+    def check_certificate_file_expiry(self, path):
+        """Check expiry of a configured certificate file without connecting"""
+        try:
+            certificate = self.facts.certificate_file(path)
+            if certificate is None:
+                return self.create_result("Certificate File Expiry", False, "No PEM certificate found in file", target=path)
 
-        return results
+            days_until_expiry = certificate_days_left(certificate)
+            details = {"days_until_expiry": days_until_expiry}
+
+            if days_until_expiry > 30:
+                return self.create_result("Certificate File Expiry", True, f"Certificate valid for {days_until_expiry} days", target=path, details=details)
+            elif days_until_expiry > 0:
+                return self.create_result("Certificate File Expiry", False, f"Certificate expires in {days_until_expiry} days", "high", target=path, details=details)
+            else:
+                return self.create_result("Certificate File Expiry", False, "Certificate has expired", "critical", target=path, details=details)
+        except Exception as e:
+            return self.create_result("Certificate File Expiry", False, f"Error reading certificate file: {str(e)}", target=path)
 
+    @reports("Web Server Version Hidden")
     def check_server_version_hidden(self, url):
         """Check if server version is hidden"""
         try:
-            response = requests.get(url, timeout=10)
+            response = requests.get(url, timeout=self.network_timeout())
             server_header = response.headers.get('Server', '')
 
             # Check if version info is exposed
             if any(word in server_header.lower() for word in ['apache/', 'nginx/', 'iis/']):
-                return self.create_result("Web Server Version Hidden", False, f"Server version exposed: {server_header}")
+                return self.create_result("Web Server Version Hidden", False, f"Server version exposed: {server_header}", target=url)
             else:
-                return self.create_result("Web Server Version Hidden", True, "Server version appears to be hidden")
+                return self.create_result("Web Server Version Hidden", True, "Server version appears to be hidden", target=url)
         except Exception as e:
-            return self.create_result("Web Server Version Hidden", False, f"Error checking server headers: {str(e)}")
+            return self.create_result("Web Server Version Hidden", False, f"Error checking server headers: {str(e)}", target=url)
 
+    @reports("Platform Version Hidden")
     def check_platform_version_hidden(self, url):
         """Check if platform version is hidden"""
         try:
-            response = requests.get(url, timeout=10)
+            response = requests.get(url, timeout=self.network_timeout())
             headers_to_check = ['X-Powered-By',
                                 'X-AspNet-Version', 'X-AspNetMvc-Version']
 
             for header in headers_to_check:
                 if header in response.headers:
-                    return self.create_result("Platform Version Hidden", False, f"Platform version exposed in {header}: {response.headers[header]}")
+                    return self.create_result("Platform Version Hidden", False, f"Platform version exposed in {header}: {response.headers[header]}", target=url)
 
-            return self.create_result("Platform Version Hidden", True, "Platform version appears to be hidden")
+            return self.create_result("Platform Version Hidden", True, "Platform version appears to be hidden", target=url)
         except Exception as e:
-            return self.create_result("Platform Version Hidden", False, f"Error checking platform headers: {str(e)}")
+            return self.create_result("Platform Version Hidden", False, f"Error checking platform headers: {str(e)}", target=url)
 
+    @reports("HTTPS Redirect")
     def check_https_redirect(self, url):
         """Check if HTTP redirects to HTTPS"""
         if not url.startswith('http://'):
-            return self.create_result("HTTPS Redirect", True, "URL is already HTTPS")
+            return self.create_result("HTTPS Redirect", True, "URL is already HTTPS", target=url)
 
         try:
-            response = requests.get(url, allow_redirects=False, timeout=10)
+            response = requests.get(url, allow_redirects=False, timeout=self.network_timeout())
 
             if response.status_code in [301, 302, 307, 308]:
                 location = response.headers.get('Location', '')
                 if location.startswith('https://'):
-                    return self.create_result("HTTPS Redirect", True, "HTTP properly redirects to HTTPS")
+                    return self.create_result("HTTPS Redirect", True, "HTTP properly redirects to HTTPS", target=url)
 
-            return self.create_result("HTTPS Redirect", False, "HTTP does not redirect to HTTPS")
+            return self.create_result("HTTPS Redirect", False, "HTTP does not redirect to HTTPS", target=url)
         except Exception as e:
-            return self.create_result("HTTPS Redirect", False, f"Error checking HTTPS redirect: {str(e)}")
+            return self.create_result("HTTPS Redirect", False, f"Error checking HTTPS redirect: {str(e)}", target=url)
 
+    @reports("HTTPS Available")
     def check_https_only(self, url):
         """Check if application runs on HTTPS"""
         https_url = url.replace('http://', 'https://')
 
         try:
-            response = requests.get(https_url, timeout=10, verify=False)
+            response = requests.get(https_url, timeout=self.network_timeout(), verify=False)
             if response.status_code == 200:
-                return self.create_result("HTTPS Available", True, "Application accessible via HTTPS")
+                return self.create_result("HTTPS Available", True, "Application accessible via HTTPS", target=url)
             else:
-                return self.create_result("HTTPS Available", False, f"HTTPS not properly configured (status: {response.status_code})")
+                return self.create_result("HTTPS Available", False, f"HTTPS not properly configured (status: {response.status_code})", target=url)
         except Exception as e:
-            return self.create_result("HTTPS Available", False, f"HTTPS not accessible: {str(e)}")
+            return self.create_result("HTTPS Available", False, f"HTTPS not accessible: {str(e)}", target=url)
@@ -5,52 +5,154 @@ Verifies essential security hardening configurations
 """
 
 import json
+import os
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from checks.ssh_checks import SSHSecurityChecker
-from checks.web_server_checks import WebServerChecker
-from checks.ssl_checks import SSLChecker
-from checks.system_checks import SystemSecurityChecker
-from checks.database_checks import DatabaseChecker
-from checks.application_checks import ApplicationChecker
 from utils.report_generator import ReportGenerator
 from utils.config_loader import ConfigLoader
+from utils.deadline import Deadline
+from utils.host_facts import HostFacts
+
+PROFILES = ["quick", "full"]
+
+
+def _checkers(profile, target_host):
+    """(checker class, run_checks args) pairs for a profile
+
+    Checkers are imported here so the quick profile never loads the HTTP,
+    TLS and database client libraries the full profile needs.
+    """
+    from checks.ssh_checks import SSHSecurityChecker
+    from checks.system_checks import SystemSecurityChecker
+
+    if profile == "snapshot":
+        from checks.ssl_checks import SSLChecker
+        from checks.web_server_checks import WebServerChecker
+        from checks.database_checks import DatabaseChecker
+        from checks.application_checks import ApplicationChecker
+
+        # Checks that read the host only through HostFacts, so they can be
+        # collected into a snapshot and evaluated from it offline. Left out:
+        # HTTP probes of target_urls (web server fallback, robots.txt,
+        # Cloudflare, sensitive path exposure) and the live database
+        # privilege audits.
+        return [
+            (SSHSecurityChecker, (target_host,)),
+            (WebServerChecker, (None, True)),
+            (SSLChecker, ()),
+            (SystemSecurityChecker, ()),
+            (DatabaseChecker, (True,)),
+            (ApplicationChecker, (True,)),
+        ]
+
+    if profile == "quick":
+        return [
+            # SSH Security Checks
+            (SSHSecurityChecker, (target_host,)),
+            # System Security Checks, without walking the web roots
+            (SystemSecurityChecker, (True,)),
+        ]
+
+    from checks.ssl_checks import SSLChecker
+    from checks.web_server_checks import WebServerChecker
+    from checks.database_checks import DatabaseChecker
+    from checks.application_checks import ApplicationChecker
+    from checks.exposure_checks import ExposureChecker
+
+    return [
+        # SSH Security Checks
+        (SSHSecurityChecker, (target_host,)),
+        # Web Server Checks
+        (WebServerChecker, (target_host,)),
+        # SSL/TLS Checks
+        (SSLChecker, ()),
+        # System Security Checks
+        (SystemSecurityChecker, ()),
+        # Database Security Checks
+        (DatabaseChecker, ()),
+        # Application Checks
+        (ApplicationChecker, ()),
+        # HTTP Exposure Checks
+        (ExposureChecker, (target_host,)),
+    ]
+
+
+def _evaluate_snapshot(config_file, path):
+    """Evaluate one snapshot file; runs inside a worker process"""
+    checklist = SecurityChecklist(config_file)
+    return checklist._run(profile="snapshot", facts=HostFacts.load(path))
 
 
 class SecurityChecklist:
     def __init__(self, config_file="config/security_config.json"):
+        self.config_file = config_file
         self.config = ConfigLoader.load_config(config_file)
         self.results = []
+        self.host = None
 
-    def run_all_checks(self, target_host=None):
-        """Run all security checks"""
+    def run_all_checks(self, target_host=None, deadline=None, profile="full"):
+        """Run the profile's security checks, optionally within a deadline in seconds"""
         print("🔍 Starting Basic Security Checklist...")
+        return self._run(target_host, deadline, profile)
 
-        # SSH Security Checks
-        ssh_checker = SSHSecurityChecker(self.config)
-        self.results.extend(ssh_checker.run_checks(target_host))
+    def _run(self, target_host=None, deadline=None, profile="full", facts=None):
+        """Run a profile's checkers against live or snapshot host facts"""
+        self.results = []
+        if facts is None:
+            facts = HostFacts(host=target_host)
 
-        # Web Server Checks
-        web_checker = WebServerChecker(self.config)
-        self.results.extend(web_checker.run_checks(target_host))
+        checkers = _checkers(profile, target_host)
 
-        # SSL/TLS Checks
-        ssl_checker = SSLChecker(self.config)
-        self.results.extend(ssl_checker.run_checks())
+        # Each checker gets an equal share of the time left, so time saved
+        # by fast checkers rolls over to the ones after them
+        run_deadline = Deadline(deadline) if deadline else None
+        for index, (checker_class, args) in enumerate(checkers):
+            checker = checker_class(self.config)
+            checker.facts = facts
+            if run_deadline is not None:
+                checker.deadline = run_deadline.child(len(checkers) - index)
+            self.results.extend(checker.run_checks(*args))
 
-        # System Security Checks
-        system_checker = SystemSecurityChecker(self.config)
-        self.results.extend(system_checker.run_checks())
+        self.host = target_host or facts.host
+        for result in self.results:
+            result["host"] = self.host
 
-        # Database Security Checks
-        db_checker = DatabaseChecker(self.config)
-        self.results.extend(db_checker.run_checks())
+        return self.results
 
-        # Application Checks
-        app_checker = ApplicationChecker(self.config)
-        self.results.extend(app_checker.run_checks())
+    def collect_snapshot(self, path, target_host=None, deadline=None):
+        """Collect the raw host facts the snapshot checkers need into a compressed file"""
+        print("🔍 Collecting host snapshot...")
+        facts = HostFacts(host=target_host)
+        self._run(target_host, deadline, "snapshot", facts)
+        facts.save(path)
+        return facts
+
+    def evaluate_snapshots(self, paths, jobs=1):
+        """Evaluate snapshot files offline, one worker process per core when jobs > 1"""
+        print(f"🔍 Evaluating {len(paths)} snapshots...")
+        jobs = min(jobs or os.cpu_count() or 1, len(paths))
+        if jobs <= 1:
+            outcomes = [_evaluate_snapshot(self.config_file, path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                outcomes = list(pool.map(_evaluate_snapshot, [self.config_file] * len(paths), paths))
+
+        self.results = [result for results in outcomes for result in results]
+        return self.results
 
+    def record_history(self, history_path, changes_only=False):
+        """Store results in the run history, optionally keeping only changes"""
+        from utils.history_store import HistoryStore
+        store = HistoryStore(history_path)
+        try:
+            previous = store.latest_results(self.host)
+            store.record_run(self.host, self.results)
+            if changes_only:
+                self.results = HistoryStore.changed_results(previous, self.results)
+        finally:
+            store.close()
         return self.results
 
     def generate_report(self, format_type="console"):
@@ -63,6 +165,10 @@ class SecurityChecklist:
         else:
             return generator.generate_console_report()
 
+    def write_report(self, output, format_type="console"):
+        """Stream the security report straight to a file"""
+        ReportGenerator(self.results).write_report(output, format_type)
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -74,17 +180,74 @@ if __name__ == "__main__":
     parser.add_argument(
         "--format", choices=["console", "json", "html"], default="console", help="Report format")
     parser.add_argument("--output", help="Output file for report")
+    parser.add_argument("--profile", choices=PROFILES, default="full",
+                        help="quick: sub-second SSH and system checks only; full: every check (default)")
+    parser.add_argument("--jobs", type=int,
+                        help="Worker processes for file content scans (0 = all cores)")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS",
+                        help="Finish the whole run within this many seconds, reporting unfinished checks as TIMEOUT")
+    parser.add_argument("--low-impact", action="store_true",
+                        help="Pace filesystem scans to the scan.budget file, byte and CPU limits")
+    parser.add_argument("--history", nargs="?", const="", metavar="DB",
+                        help="Record results in the run history database (default: history.path from config)")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="Report only results that changed since the previous recorded run")
+    parser.add_argument("--exporter", action="store_true",
+                        help="Serve results as Prometheus metrics, rescanning in the background")
+    parser.add_argument("--listen", help="Exporter listen address (default: exporter.listen from config)")
+    parser.add_argument("--merge", nargs="+", metavar="REPORT",
+                        help="Merge existing JSON reports instead of running checks")
+    parser.add_argument("--collect", metavar="SNAPSHOT",
+                        help="Collect raw host facts into a compressed snapshot instead of reporting")
+    parser.add_argument("--evaluate", nargs="+", metavar="SNAPSHOT",
+                        help="Evaluate snapshots offline instead of checking this host (--jobs sets worker processes)")
 
     args = parser.parse_args()
 
+    if args.evaluate and (args.history is not None or args.changes_only):
+        parser.error("--history and --changes-only record a single host and cannot be used with --evaluate")
+
+    if args.merge:
+        generator = ReportGenerator.from_json_reports(args.merge)
+        if args.output:
+            generator.write_report(args.output, args.format)
+            print(f"Report saved to {args.output}")
+        else:
+            generator.write_report(sys.stdout, args.format)
+        sys.exit(0)
+
     checker = SecurityChecklist(args.config)
-    results = checker.run_all_checks(args.host)
 
-    report = checker.generate_report(args.format)
+    if args.jobs is not None:
+        checker.config['scan']['jobs'] = args.jobs
+    if args.low_impact:
+        checker.config['scan'].setdefault('budget', {})['enabled'] = True
+
+    if args.collect:
+        checker.collect_snapshot(args.collect, args.host, args.deadline)
+        print(f"Snapshot saved to {args.collect}")
+        sys.exit(0)
+
+    if args.exporter:
+        from utils.metrics_exporter import MetricsExporter
+        exporter_config = checker.config['exporter']
+        exporter = MetricsExporter(lambda: checker.run_all_checks(args.host, args.deadline, args.profile),
+                                   interval=exporter_config['interval'],
+                                   listen=args.listen or exporter_config['listen'])
+        exporter.serve_forever()
+        sys.exit(0)
+
+    if args.evaluate:
+        results = checker.evaluate_snapshots(args.evaluate, args.jobs if args.jobs is not None else 0)
+    else:
+        results = checker.run_all_checks(args.host, args.deadline, args.profile)
+
+    if args.history is not None or args.changes_only:
+        history_path = args.history or checker.config['history']['path']
+        results = checker.record_history(history_path, args.changes_only)
 
     if args.output:
-        with open(args.output, 'w') as f:
-            f.write(report)
+        checker.write_report(args.output, args.format)
         print(f"Report saved to {args.output}")
     else:
-        print(report)
+        print(checker.generate_report(args.format))
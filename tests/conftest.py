@@ -0,0 +1,70 @@
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope='session')
+def make_certificate(tmp_path_factory):
+    """Create a self-signed certificate and key with openssl(1)"""
+    if shutil.which('openssl') is None:
+        pytest.skip("openssl command not available")
+    directory = tmp_path_factory.mktemp('certs')
+
+    def make(name, bits=2048, days=90):
+        cert, key = directory / f'{name}.pem', directory / f'{name}.key'
+        subprocess.run(['openssl', 'req', '-x509', '-newkey', f'rsa:{bits}', '-nodes',
+                        '-keyout', str(key), '-out', str(cert), '-days', str(days),
+                        '-subj', '/CN=localhost'],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return str(cert), str(key)
+
+    return make
+
+
+@pytest.fixture
+def tls_server():
+    """Start local TLS servers that answer one HTTP request per connection"""
+    servers = []
+
+    def start(context, headers=b''):
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', _free_port()))
+        listener.listen(64)
+        servers.append(listener)
+
+        def handle(connection):
+            try:
+                with context.wrap_socket(connection, server_side=True) as tls:
+                    tls.recv(4096)
+                    tls.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n" + headers + b"\r\n")
+            except (ssl.SSLError, OSError):
+                connection.close()
+
+        def serve():
+            while True:
+                try:
+                    connection, _ = listener.accept()
+                except OSError:
+                    return
+                threading.Thread(target=handle, args=(connection,), daemon=True).start()
+
+        threading.Thread(target=serve, daemon=True).start()
+        return f"127.0.0.1:{listener.getsockname()[1]}"
+
+    yield start
+    for listener in servers:
+        listener.close()
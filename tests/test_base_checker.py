@@ -0,0 +1,100 @@
+import multiprocessing
+import threading
+import time
+
+from checks.base_checker import BaseChecker, CheckContext
+from checks.database_checks import DatabaseChecker
+from checks.exposure_checks import ExposureChecker
+from checks.ssl_checks import SSLChecker
+from checks.web_server_checks import WebServerChecker
+from utils.file_scanner import FileScanner
+from utils.http_prober import HTTPProber
+
+
+def test_timeout_result_uses_declared_name_and_target():
+    checker = SSLChecker({})
+    result = checker.run_check(checker.check_ssl_grade, 'example.com', timeout=0)
+
+    assert result["check_name"] == "SSL Certificate Grade"
+    assert result["target"] == 'example.com'
+    assert result["status"] == "TIMEOUT"
+    assert result["category"] == "SSL"
+
+
+def test_timeout_result_covers_every_result_of_a_check():
+    checker = DatabaseChecker({})
+    results = checker.run_check(checker.check_mysql_privileges, timeout=0)
+
+    assert [result["check_name"] for result in results] == [
+        "MySQL Remote Root Access", "MySQL Empty Passwords", "MySQL Broad Grants"]
+
+
+def test_timeout_result_targets():
+    exposure = ExposureChecker({'web_server': {'target_urls': ['http://a/', 'https://a']}})
+    results = exposure.run_check(exposure.check_exposed_paths, timeout=0)
+    assert [result["target"] for result in results] == ['http://a', 'https://a']
+
+    web = WebServerChecker({})
+    virtual_host = {'target': 'nginx:example.com:443'}
+    result = web.run_check(web.check_config_https_available, virtual_host, [virtual_host], timeout=0)
+    assert result["check_name"] == "HTTPS Available"
+    assert result["target"] == 'nginx:example.com:443'
+
+
+def test_worker_threads_see_cancellation():
+    checker = BaseChecker({})
+    stopped = threading.Event()
+
+    def check_slow():
+        is_cancelled = checker.cancellation_flag()
+
+        def worker():
+            while not is_cancelled():
+                time.sleep(0.01)
+            stopped.set()
+
+        threading.Thread(target=worker, daemon=True).start()
+        time.sleep(5)
+
+    result = checker.run_check(check_slow, timeout=0.1)
+    assert result["status"] == "TIMEOUT"
+    assert result["check_name"] == "Slow"
+    assert stopped.wait(1)
+
+
+def test_cancelled_prober_sends_no_requests(monkeypatch):
+    prober = HTTPProber(['/.env', '/.git/HEAD'], requests_per_second=1)
+    sent = []
+    monkeypatch.setattr(prober, '_session', lambda: sent.append(1))
+
+    started = time.monotonic()
+    assert prober.probe(['http://127.0.0.1:1'], lambda: True) == ({'http://127.0.0.1:1': []}, {})
+    assert time.monotonic() - started < 1
+    assert sent == []
+
+
+def test_cancel_kills_only_the_checks_own_workers():
+    own = multiprocessing.Process(target=time.sleep, args=(30,))
+    other = multiprocessing.Process(target=time.sleep, args=(30,))
+    own.start()
+    other.start()
+    try:
+        context = CheckContext(time.monotonic())
+        context.workers.append(own)
+        context.cancel()
+        own.join(5)
+        assert not own.is_alive()
+        assert other.is_alive()
+    finally:
+        other.kill()
+        other.join()
+
+
+def test_scan_pool_workers_are_tracked(tmp_path):
+    for index in range(4):
+        (tmp_path / f'config{index}.env').write_text('APP_DEBUG=true\n')
+    tracked = []
+    scanner = FileScanner(jobs=2, shard_size=1, track_workers=tracked.extend)
+
+    assert len(scanner.grep_files([str(tmp_path)], [('*.env', 'APP_DEBUG')])) == 4
+    assert tracked and all(isinstance(worker, multiprocessing.process.BaseProcess) for worker in tracked)
@@ -0,0 +1,156 @@
+import pytest
+
+from checks import database_checks
+from checks.database_checks import DatabaseChecker
+
+
+class FakeCursor:
+    """DB-API cursor answering each query with the rows of the first matching table"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rows = None
+
+    def execute(self, query):
+        if self.connection.error:
+            raise self.connection.error
+        self.rows = next(rows for table, rows in self.connection.tables.items() if table in query)
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, tables, error=None):
+        self.tables = tables
+        self.error = error
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+def _mysql_checker(monkeypatch, accounts, error=None):
+    connection = FakeConnection({'mysql.user': accounts}, error)
+    monkeypatch.setattr(database_checks, 'PYMYSQL_AVAILABLE', True)
+    checker = DatabaseChecker({'database': {'mysql': {'user': 'auditor'}}})
+    monkeypatch.setattr(checker, '_connect_mysql', lambda: connection)
+    return checker, connection
+
+
+def _postgresql_checker(monkeypatch, roles, public_grants=(), error=None):
+    connection = FakeConnection({'pg_roles': roles, 'role_table_grants': list(public_grants)}, error)
+    monkeypatch.setattr(database_checks, 'PSYCOPG2_AVAILABLE', True)
+    checker = DatabaseChecker({'database': {'postgresql': {'user': 'auditor'}}})
+    monkeypatch.setattr(checker, '_connect_postgresql', lambda: connection)
+    return checker, connection
+
+
+def _by_name(results):
+    return {result["check_name"]: result for result in results}
+
+
+def _account(user, host, plugin='mysql_native_password', empty_password=0, *privileges):
+    return (user, host, plugin, empty_password) + (privileges or ('N',) * 5)
+
+
+def test_mysql_clean_accounts_pass(monkeypatch):
+    checker, _ = _mysql_checker(monkeypatch, [
+        _account('root', 'localhost', 'auth_socket', 1, 'Y', 'Y', 'Y', 'Y', 'Y'),
+        _account('app', '%'),
+    ])
+
+    results = _by_name(checker.check_mysql_privileges())
+    assert all(result["passed"] for result in results.values())
+    assert set(results) == {"MySQL Remote Root Access", "MySQL Empty Passwords", "MySQL Broad Grants"}
+
+
+def test_mysql_remote_root(monkeypatch):
+    checker, _ = _mysql_checker(monkeypatch, [_account('root', '%'), _account('root', '::1')])
+
+    result = _by_name(checker.check_mysql_privileges())["MySQL Remote Root Access"]
+    assert not result["passed"]
+    assert result["severity"] == "critical"
+    assert "'root'@'%'" in result["message"]
+    assert "::1" not in result["message"]
+
+
+def test_mysql_empty_password_exempts_socket_auth(monkeypatch):
+    checker, _ = _mysql_checker(monkeypatch, [
+        _account('root', 'localhost', 'unix_socket', 1),
+        _account('app', 'localhost', 'mysql_native_password', 1),
+    ])
+
+    result = _by_name(checker.check_mysql_privileges())["MySQL Empty Passwords"]
+    assert not result["passed"]
+    assert "'app'@'localhost'" in result["message"]
+    assert "root" not in result["message"]
+
+
+def test_mysql_broad_grants(monkeypatch):
+    checker, _ = _mysql_checker(monkeypatch, [
+        _account('debian-sys-maint', 'localhost', 'mysql_native_password', 0, 'Y', 'Y', 'Y', 'Y', 'Y'),
+        _account('app', '%', 'mysql_native_password', 0, 'N', 'N', 'Y', 'N', 'N'),
+    ])
+
+    result = _by_name(checker.check_mysql_privileges())["MySQL Broad Grants"]
+    assert not result["passed"]
+    assert result["message"].endswith("'app'@'%'")
+
+
+def test_postgresql_superuser_roles(monkeypatch):
+    checker, _ = _postgresql_checker(monkeypatch, [
+        ('postgres', True, True, True),
+        ('deploy', True, False, False),
+        ('app', False, False, False),
+    ])
+
+    results = _by_name(checker.check_postgresql_privileges())
+    assert not results["PostgreSQL Superuser Roles"]["passed"]
+    assert results["PostgreSQL Superuser Roles"]["message"].endswith(": deploy")
+    assert results["PostgreSQL Broad Grants"]["passed"]
+
+
+@pytest.mark.parametrize("role, public_grants, expected", [
+    (('admin', False, True, False), [], "roles with CREATEROLE/BYPASSRLS: admin"),
+    (('etl', False, False, True), [], "roles with CREATEROLE/BYPASSRLS: etl"),
+    (('app', False, False, False), [('public.users',)], "tables granted to PUBLIC: public.users"),
+])
+def test_postgresql_broad_grants(monkeypatch, role, public_grants, expected):
+    checker, _ = _postgresql_checker(monkeypatch, [('postgres', True, True, True), role], public_grants)
+
+    results = _by_name(checker.check_postgresql_privileges())
+    assert results["PostgreSQL Superuser Roles"]["passed"]
+    assert not results["PostgreSQL Broad Grants"]["passed"]
+    assert expected in results["PostgreSQL Broad Grants"]["message"]
+
+
+def test_query_error_is_reported(monkeypatch):
+    checker, _ = _postgresql_checker(monkeypatch, [], error=RuntimeError("permission denied"))
+
+    [result] = checker.check_postgresql_privileges()
+    assert result["check_name"] == "PostgreSQL Privilege Audit"
+    assert not result["passed"]
+    assert "permission denied" in result["message"]
+
+
+def test_connections_closed_when_a_check_raises(monkeypatch):
+    checker, connection = _mysql_checker(monkeypatch, [_account('root', 'localhost')])
+    for check in ('check_mysql_root_access', 'check_postgresql_superuser_access',
+                  'check_database_passwords'):
+        monkeypatch.setattr(checker, check, lambda: [])
+
+    def failing_check():
+        raise RuntimeError("check crashed")
+
+    # check_mysql_privileges has pooled its connection by the time the last check fails
+    monkeypatch.setattr(checker, 'check_postgresql_privileges', failing_check)
+    with pytest.raises(RuntimeError):
+        checker.run_checks()
+    assert connection.closed
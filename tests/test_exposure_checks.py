@@ -0,0 +1,97 @@
+import functools
+import socket
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from checks.exposure_checks import ExposureChecker
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def web_root(tmp_path):
+    """Local HTTP server serving tmp_path, as "http://127.0.0.1:port" """
+    server = ThreadingHTTPServer(('127.0.0.1', 0),
+                                 functools.partial(QuietHandler, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield tmp_path, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def _checker(urls, **exposure):
+    exposure.setdefault('paths', ['/.env', '/.git/HEAD', '/backup.sql', '/phpinfo.php'])
+    return ExposureChecker({'web_server': {'target_urls': urls}, 'exposure': exposure})
+
+
+def test_exposed_file_is_reported(web_root):
+    root, url = web_root
+    (root / '.env').write_text('APP_KEY=secret\n')
+
+    [result] = _checker([url]).check_exposed_paths()
+    assert not result["passed"]
+    assert result["severity"] == "critical"
+    assert "/.env" in result["message"]
+
+
+def test_clean_host_passes(web_root):
+    _, url = web_root
+
+    [result] = _checker([url]).check_exposed_paths()
+    assert result["passed"]
+    assert result["target"] == url
+
+
+def test_unreachable_target_fails(web_root):
+    _, url = web_root
+    unreachable = _closed_port_url()
+
+    reachable_result, unreachable_result = _checker([url, unreachable]).check_exposed_paths()
+    assert reachable_result["passed"]
+    assert not unreachable_result["passed"]
+    host_port = unreachable.split('//')[1]
+    assert unreachable_result["message"] == f"Could not reach {unreachable}: ConnectionError connecting to {host_port}"
+    assert "Connection refused" in unreachable_result["details"]["detail"]
+
+
+def test_unreachable_message_is_stable_across_runs():
+    unreachable = _closed_port_url()
+    first = _checker([unreachable]).check_exposed_paths()[0]["message"]
+    assert _checker([unreachable]).check_exposed_paths()[0]["message"] == first
+
+
+def test_unreachable_target_stops_probing():
+    # 20 paths at 2 requests per second would take 10s if every one were tried
+    checker = _checker([_closed_port_url()], paths=[f'/path{i}' for i in range(20)],
+                       requests_per_second=2)
+
+    started = time.monotonic()
+    [result] = checker.check_exposed_paths()
+    assert time.monotonic() - started < 2
+    assert not result["passed"]
+
+
+def test_failing_https_does_not_hide_http_on_same_host(web_root):
+    root, url = web_root
+    (root / '.env').write_text('APP_KEY=secret\n')
+    # TLS to the plain HTTP server fails with an SSLError, a ConnectionError
+    https_url = url.replace('http://', 'https://')
+
+    http_result, https_result = _checker([url, https_url]).check_exposed_paths()
+    assert not http_result["passed"]
+    assert http_result["severity"] == "critical"
+    assert "/.env" in http_result["message"]
+    assert https_result["message"].startswith(f"Could not reach {https_url}")
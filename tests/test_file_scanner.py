@@ -0,0 +1,88 @@
+import time
+
+from utils.file_scanner import FileScanner
+from utils.scan_budget import ScanBudget
+from utils.scan_filter import ScanFilter
+
+
+def _budget(**overrides):
+    # No CPU share or load/PSI backoff, so timings only depend on the rates
+    settings = dict(files_per_second=0, bytes_per_second=0, cpu_share=0,
+                    max_load_per_cpu=0, max_pressure=0)
+    settings.update(overrides)
+    return ScanBudget(**settings)
+
+
+def test_budget_paces_files():
+    budget = _budget(files_per_second=100)
+    started = time.monotonic()
+    for _ in range(10):
+        budget.charge(files=2)
+    assert 0.15 <= time.monotonic() - started < 1
+
+
+def test_budget_window():
+    budget = _budget(max_walk_seconds=0.05)
+    assert not budget.window_expired()
+    time.sleep(0.06)
+    assert budget.window_expired()
+    budget.start_walk()
+    assert not budget.window_expired()
+    assert not _budget().window_expired()
+
+
+def test_window_is_enforced_inside_a_large_directory(tmp_path):
+    web_root = tmp_path / 'www'
+    web_root.mkdir()
+    for index in range(600):
+        (web_root / f'test_{index:03}.php').write_text('')
+    (web_root / 'nested').mkdir()
+    (web_root / 'nested' / 'test_nested.php').write_text('')
+    scanner = FileScanner(budget=_budget(files_per_second=500, max_walk_seconds=0.2),
+                          checkpoint_file=str(tmp_path / 'checkpoint.json'))
+
+    started = time.monotonic()
+    found = scanner.find_files([str(web_root)], ['test_*'])
+    assert time.monotonic() - started < 0.6
+    assert not scanner.complete
+    assert 0 < len(found) < 601
+
+    # Each resumed walk picks up after the last name done in the directory
+    runs = 1
+    while not scanner.complete:
+        found = scanner.find_files([str(web_root)], ['test_*'])
+        runs += 1
+        assert runs < 20
+    assert len(found) == len(set(found)) == 601
+    assert str(web_root / 'nested' / 'test_nested.php') in found
+
+
+def test_completed_walk_clears_its_checkpoint(tmp_path):
+    (tmp_path / 'test_a.php').write_text('')
+    checkpoint = tmp_path / 'checkpoint.json'
+    scanner = FileScanner(budget=_budget(max_walk_seconds=60), checkpoint_file=str(checkpoint))
+
+    assert scanner.find_files([str(tmp_path)], ['test_*']) == [str(tmp_path / 'test_a.php')]
+    assert scanner.complete
+    assert checkpoint.read_text() == '{}'
+
+
+def test_sharded_grep_matches_single_process(tmp_path):
+    for index in range(12):
+        directory = tmp_path / f'app{index % 3}'
+        directory.mkdir(exist_ok=True)
+        (directory / f'config{index}.env').write_text(f'APP_DEBUG={"true" if index % 2 else "false"}\n')
+    for index in range(3):
+        (tmp_path / f'dump{index}.env').write_bytes(b'\x00APP_DEBUG=true\n')
+    rules = [('*.env', 'APP_DEBUG=true')]
+
+    def scan(jobs):
+        scanner = FileScanner(jobs=jobs, shard_size=2, scan_filter=ScanFilter(skip_binary=True))
+        return scanner.grep_files([str(tmp_path)], rules), scanner.scan_details()
+
+    single, single_details = scan(1)
+    sharded, sharded_details = scan(4)
+    assert len(single) == 6
+    assert sharded == single == sorted(single)
+    assert sharded_details == single_details == {
+        "skipped_directories": 0, "skipped_files": 3, "skipped_bytes": 48}
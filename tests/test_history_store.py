@@ -0,0 +1,81 @@
+import sqlite3
+
+from utils.history_store import HistoryStore
+
+
+def _result(check_name, passed=True, message="ok", target=None, status=None):
+    result = {"check_name": check_name, "passed": passed, "message": message,
+              "severity": "medium", "target": target, "category": "System"}
+    if status:
+        result["status"] = status
+    return result
+
+
+def _rerun(tmp_path, first, second):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    try:
+        store.record_run('web1', first, '2026-01-01T00:00:00')
+        previous = store.latest_results('web1')
+        store.record_run('web1', second, '2026-01-02T00:00:00')
+        return HistoryStore.changed_results(previous, second)
+    finally:
+        store.close()
+
+
+def test_first_run_is_all_new(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    results = [_result("Fail2ban Protection"), _result("Open Ports Check", False, "port 8080")]
+    assert store.latest_results('web1') is None
+    changed = HistoryStore.changed_results(store.latest_results('web1'), results)
+    store.close()
+    assert [result["change"] for result in changed] == ["new", "new"]
+
+
+def test_unchanged_rerun_is_empty(tmp_path):
+    results = [_result("Fail2ban Protection"), _result("SSL Certificate Grade", target='a')]
+    assert _rerun(tmp_path, results, [dict(result) for result in results]) == []
+
+
+def test_status_change_is_reported(tmp_path):
+    message = "Check did not finish within its share of the run deadline"
+    [changed] = _rerun(tmp_path, [_result("Open Ports Check", False, message)],
+                       [_result("Open Ports Check", False, message, status="TIMEOUT")])
+    assert changed["change"] == "changed"
+    assert changed["previous_status"] == "FAIL"
+    assert changed["previous_passed"] is False
+
+
+def test_message_change_is_reported(tmp_path):
+    [changed] = _rerun(tmp_path, [_result("Open Ports Check", False, "port 8080")],
+                       [_result("Open Ports Check", False, "port 9090")])
+    assert changed["previous_status"] == "FAIL"
+
+
+def test_repeated_timeout_is_unchanged(tmp_path):
+    message = "Check did not finish within its share of the run deadline"
+    first = [_result("Open Ports Check", False, message, status="TIMEOUT")]
+    assert _rerun(tmp_path, first, [dict(result) for result in first]) == []
+
+
+def test_history_without_status_column_is_migrated(tmp_path):
+    path = str(tmp_path / 'history.db')
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE runs (id INTEGER PRIMARY KEY, host TEXT NOT NULL, started_at TEXT NOT NULL);
+        CREATE TABLE checks (id INTEGER PRIMARY KEY, category TEXT NOT NULL, check_name TEXT NOT NULL,
+                             target TEXT NOT NULL, UNIQUE (category, check_name, target));
+        CREATE TABLE messages (id INTEGER PRIMARY KEY, text TEXT NOT NULL UNIQUE);
+        CREATE TABLE results (run_id INTEGER NOT NULL, check_id INTEGER NOT NULL, passed INTEGER NOT NULL,
+                              severity TEXT NOT NULL, message_id INTEGER NOT NULL,
+                              PRIMARY KEY (run_id, check_id)) WITHOUT ROWID;
+        INSERT INTO runs VALUES (1, 'web1', '2026-01-01T00:00:00');
+        INSERT INTO checks VALUES (1, 'System', 'Fail2ban Protection', '');
+        INSERT INTO messages VALUES (1, 'ok');
+        INSERT INTO results VALUES (1, 1, 1, 'medium', 1);
+    """)
+    connection.commit()
+    connection.close()
+
+    store = HistoryStore(path)
+    assert store.latest_results('web1') == {('System', 'Fail2ban Protection', ''): ('PASS', 'ok')}
+    store.close()
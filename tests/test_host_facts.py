@@ -0,0 +1,57 @@
+from checks.application_checks import ApplicationChecker
+from checks.web_server_checks import WebServerChecker
+from utils.host_facts import HostFacts
+
+
+def _snapshot_round_trip(tmp_path, checker_class, config, *args):
+    """Results of a live run and of evaluating the snapshot it collected"""
+    live = checker_class(config)
+    live_results = live.run_checks(*args)
+    path = str(tmp_path / 'snapshot.json.gz')
+    live.facts.save(path)
+
+    offline = checker_class(config)
+    offline.facts = HostFacts.load(path)
+    return live_results, offline.run_checks(*args)
+
+
+def _outcomes(results):
+    return [(result["check_name"], result["passed"], result["message"], result["target"],
+             result["details"]) for result in results]
+
+
+def test_web_root_scans_replay_offline(tmp_path):
+    web_root = tmp_path / 'www'
+    web_root.mkdir()
+    (web_root / '.env').write_text('APP_DEBUG=true\n')
+    (web_root / 'phpinfo.php').write_text('<?php phpinfo();\n')
+    config = {'application': {'web_roots': [str(web_root)]}}
+
+    live, offline = _snapshot_round_trip(tmp_path, ApplicationChecker, config, True)
+    assert [result["check_name"] for result in live] == ["Production Configuration", "Test Data Cleanup"]
+    assert not any(result["passed"] for result in live)
+    assert _outcomes(offline) == _outcomes(live)
+
+
+def test_web_server_configs_replay_offline(tmp_path):
+    (tmp_path / 'nginx.conf').write_text(
+        "events {}\nhttp {\n    server {\n        listen 80;\n        server_name example.com;\n"
+        "        server_tokens on;\n    }\n}\n")
+    config = {'web_server': {'server_configs': {'nginx': [str(tmp_path / 'nginx.conf')]}}}
+
+    live, offline = _snapshot_round_trip(tmp_path, WebServerChecker, config, None, True)
+    assert "Web Server Version Hidden" in [result["check_name"] for result in live]
+    assert _outcomes(offline) == _outcomes(live)
+
+
+def test_config_parse_error_replays_offline(tmp_path):
+    (tmp_path / 'nginx.conf').write_text("http {\n    server {\n")
+    config = {'web_server': {'server_configs': {'nginx': [str(tmp_path / 'nginx.conf')]}}}
+
+    live, offline = _snapshot_round_trip(tmp_path, WebServerChecker, config, None, True)
+    assert live[0]["message"].startswith("Could not parse web server config")
+    assert _outcomes(offline) == _outcomes(live)
+
+
+def test_local_only_web_checks_skip_http_fallback():
+    assert WebServerChecker({'web_server': {'server_configs': {}}}).run_checks(None, True) == []
@@ -0,0 +1,64 @@
+from checks.base_checker import BaseChecker
+from utils.metrics_exporter import MetricsExporter
+
+
+def _result(check_name, duration, invocation, target=None, category='Exposure'):
+    return {"check_name": check_name, "passed": True, "severity": "medium", "target": target,
+            "details": None, "category": category, "host": "web1", "duration": duration,
+            "invocation": invocation}
+
+
+def _sample(text, name):
+    return next(line.rsplit(' ', 1)[1] for line in text.splitlines() if line.startswith(name))
+
+
+def test_list_returning_check_is_observed_once():
+    results = [
+        # One check_exposed_paths invocation reporting two targets
+        _result("Sensitive Path Exposure", 1.5, 'e1', 'http://a'),
+        _result("Sensitive Path Exposure", 1.5, 'e1', 'https://a'),
+        # Two check_ssl_grade invocations
+        _result("SSL Certificate Grade", 0.2, 's1', 'a', 'SSL'),
+        _result("SSL Certificate Grade", 0.3, 's2', 'b', 'SSL'),
+        # Two consecutive calls that took the same time
+        _result("Certificate File Expiry", 0.0, 'c1', '/a.pem', 'WebServer'),
+        _result("Certificate File Expiry", 0.0, 'c2', '/b.pem', 'WebServer'),
+    ]
+    exporter = MetricsExporter(lambda: results)
+    exporter.refresh()
+    text = exporter.render()
+
+    exposure = 'security_check_duration_seconds_count{category="Exposure",check="Sensitive Path Exposure"}'
+    ssl = 'security_check_duration_seconds_count{category="SSL",check="SSL Certificate Grade"}'
+    certificate = 'security_check_duration_seconds_count{category="WebServer",check="Certificate File Expiry"}'
+    assert _sample(text, exposure) == '1'
+    assert _sample(text, ssl) == '2'
+    assert _sample(text, certificate) == '2'
+
+
+def test_run_check_stamps_one_invocation_per_call():
+    checker = BaseChecker({})
+    first = checker.run_check(lambda: checker.create_result("X", True, "a"))
+    second = checker.run_check(lambda: checker.create_result("X", True, "a"))
+    assert first["invocation"] != second["invocation"]
+
+    both = checker.run_check(lambda: [checker.create_result("X", True, "a"),
+                                      checker.create_result("X", True, "b")])
+    assert both[0]["invocation"] == both[1]["invocation"]
+
+
+def test_scan_errors_is_a_counter():
+    def failing_scan():
+        raise RuntimeError("boom")
+
+    exporter = MetricsExporter(failing_scan)
+    exporter.refresh()
+    exporter.refresh()
+
+    text = exporter.render()
+    assert "# TYPE security_scan_errors_total counter" in text
+    assert "security_scan_errors_total 2" in text.splitlines()
+
+    openmetrics = exporter.render(openmetrics=True)
+    assert "# TYPE security_scan_errors counter" in openmetrics
+    assert "security_scan_errors_total 2" in openmetrics.splitlines()
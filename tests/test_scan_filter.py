@@ -0,0 +1,77 @@
+import pytest
+
+from utils.file_scanner import FileScanner
+from utils.scan_filter import ScanFilter
+
+
+@pytest.mark.parametrize("patterns, path, is_dir, excluded", [
+    # A name without a slash matches at any depth
+    (["*.log"], "debug.log", False, True),
+    (["*.log"], "app/logs/debug.log", False, True),
+    (["*.log"], "debug.log.txt", False, False),
+    # * and ? never cross a slash
+    (["app/*.php"], "app/index.php", False, True),
+    (["app/*.php"], "app/sub/index.php", False, False),
+    (["test?.php"], "test1.php", False, True),
+    (["test?.php"], "test10.php", False, False),
+    # A leading or inner slash anchors to the walk root
+    (["/cache"], "cache", True, True),
+    (["/cache"], "app/cache", True, False),
+    (["app/cache"], "app/cache", True, True),
+    (["app/cache"], "x/app/cache", True, False),
+    # ** spans any number of directories
+    (["**/tmp"], "tmp", True, True),
+    (["**/tmp"], "a/b/tmp", True, True),
+    (["app/**/cache"], "app/cache", True, True),
+    (["app/**/cache"], "app/a/b/cache", True, True),
+    (["logs/**"], "logs/a/b.log", False, True),
+    # A trailing slash matches directories only
+    (["node_modules/"], "node_modules", True, True),
+    (["node_modules/"], "node_modules", False, False),
+    # Character classes, including negation
+    (["backup.[tz]ar"], "backup.tar", False, True),
+    (["backup.[tz]ar"], "backup.rar", False, False),
+    (["file[!0-9].txt"], "filea.txt", False, True),
+    (["file[!0-9].txt"], "file1.txt", False, False),
+    # ! re-includes, and the last matching pattern wins
+    (["*.log", "!keep.log"], "keep.log", False, False),
+    (["!keep.log", "*.log"], "keep.log", False, True),
+    # Comments, blank lines and escapes
+    (["# *.log", ""], "debug.log", False, False),
+    (["\\#notes"], "#notes", False, True),
+])
+def test_gitignore_semantics(patterns, path, is_dir, excluded):
+    assert ScanFilter(patterns).excluded(path, is_dir) is excluded
+
+
+def test_size_and_binary_limits():
+    scan_filter = ScanFilter(max_file_size=100)
+    assert scan_filter.too_large(101)
+    assert not scan_filter.too_large(100)
+    assert not ScanFilter().too_large(10 ** 12)
+    assert ScanFilter.is_binary(b'PK\x03\x04\x00')
+    assert not ScanFilter.is_binary(b'APP_DEBUG=true\n')
+
+
+def test_walk_prunes_excluded_paths_and_counts_skips(tmp_path):
+    (tmp_path / 'node_modules' / 'pkg').mkdir(parents=True)
+    (tmp_path / 'node_modules' / 'pkg' / 'test_a.js').write_text('x')
+    (tmp_path / 'app').mkdir()
+    (tmp_path / 'app' / 'test_b.js').write_text('x')
+    (tmp_path / 'app' / 'test_c.log').write_text('12345')
+    (tmp_path / 'app' / 'test_keep.log').write_text('x')
+    scanner = FileScanner(scan_filter=ScanFilter(['node_modules/', '*.log', '!test_keep.log']))
+
+    found = scanner.find_files([str(tmp_path)], ['test_*'])
+    assert found == [str(tmp_path / 'app' / 'test_b.js'), str(tmp_path / 'app' / 'test_keep.log')]
+    assert scanner.scan_details() == {"skipped_directories": 1, "skipped_files": 1, "skipped_bytes": 5}
+
+
+def test_grep_skips_large_and_binary_files(tmp_path):
+    (tmp_path / 'small.env').write_text('APP_DEBUG=true\n')
+    (tmp_path / 'large.env').write_text('APP_DEBUG=true\n' + 'x' * 100)
+    (tmp_path / 'binary.env').write_bytes(b'\x00APP_DEBUG=true\n')
+    scanner = FileScanner(scan_filter=ScanFilter(max_file_size=50, skip_binary=True))
+
+    assert scanner.grep_files([str(tmp_path)], [('*.env', 'APP_DEBUG=true')]) == [str(tmp_path / 'small.env')]
+    assert scanner.scan_details() == {"skipped_directories": 0, "skipped_files": 2, "skipped_bytes": 115 + 16}
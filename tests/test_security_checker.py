@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+import security_checker
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_quick_profile_does_not_load_ssl():
+    # A fresh interpreter, since this one has already imported ssl
+    completed = subprocess.run(
+        [sys.executable, '-c',
+         "import sys, security_checker; security_checker._checkers('quick', None); "
+         "print(sorted({'ssl', 'requests', 'checks.ssl_checks'} & set(sys.modules)))"],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True, check=True)
+    assert completed.stdout.strip() == '[]'
+
+
+def test_snapshot_and_full_profiles_include_ssl():
+    from checks.ssl_checks import SSLChecker
+    for profile in ("snapshot", "full"):
+        assert SSLChecker in [checker for checker, _ in security_checker._checkers(profile, None)]
@@ -0,0 +1,108 @@
+import textwrap
+
+import pytest
+
+from utils.server_config import apache_virtual_hosts, nginx_virtual_hosts
+
+
+def _nginx_host(tmp_path, http_body):
+    path = tmp_path / 'nginx.conf'
+    path.write_text("events {}\nhttp {\n" + textwrap.dedent(http_body) + "}\n")
+    [virtual_host] = nginx_virtual_hosts(str(path))
+    return virtual_host
+
+
+PHP_FPM_SERVER = """
+    server {
+        listen 80;
+        server_name example.com;
+        root /var/www/html;
+        location / {
+            try_files $uri $uri/ /index.php?$query_string;
+        }
+        location ~ \\.php$ {
+            include fastcgi_params;
+            fastcgi_pass unix:/run/php/php-fpm.sock;
+            %s
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize("location_directive", [
+    "fastcgi_hide_header X-Powered-By;",
+    "more_clear_headers X-Powered-By;",
+])
+def test_php_location_hiding_its_backend(tmp_path, location_directive):
+    virtual_host = _nginx_host(tmp_path, PHP_FPM_SERVER % location_directive)
+    assert virtual_host["backend"]
+    assert virtual_host["hides_powered_by"]
+
+
+def test_hide_header_inherited_from_http(tmp_path):
+    virtual_host = _nginx_host(tmp_path, "fastcgi_hide_header X-Powered-By;\n" + PHP_FPM_SERVER % "")
+    assert virtual_host["hides_powered_by"]
+
+
+def test_location_hide_header_overrides_inherited_one(tmp_path):
+    # A location with its own fastcgi_hide_header no longer inherits the server's
+    virtual_host = _nginx_host(tmp_path, (PHP_FPM_SERVER % "fastcgi_hide_header X-Debug;").replace(
+        "root /var/www/html;", "root /var/www/html;\n        fastcgi_hide_header X-Powered-By;"))
+    assert not virtual_host["hides_powered_by"]
+
+
+def test_every_backend_location_must_hide(tmp_path):
+    server = (PHP_FPM_SERVER % "fastcgi_hide_header X-Powered-By;").replace(
+        "location / {", "location /api/ {\n            proxy_pass http://127.0.0.1:3000;\n        }\n        location / {")
+    virtual_host = _nginx_host(tmp_path, server)
+    assert virtual_host["backend"]
+    assert not virtual_host["hides_powered_by"]
+
+
+DEBIAN_PHP_FPM_CONF = """
+<FilesMatch ".+\\.ph(?:ar|p|tml)$">
+    SetHandler "proxy:unix:/run/php/php8.2-fpm.sock|fcgi://localhost"
+</FilesMatch>
+"""
+
+
+def _apache_host(tmp_path, site, module_conf=None):
+    (tmp_path / 'conf-enabled').mkdir()
+    if module_conf is not None:
+        (tmp_path / 'conf-enabled' / 'php8.2-fpm.conf').write_text(
+            "<IfModule proxy_fcgi_module>\n" + module_conf + "</IfModule>\n")
+    (tmp_path / 'apache2.conf').write_text(
+        f"ServerRoot {tmp_path}\nIncludeOptional conf-enabled/*.conf\n" + textwrap.dedent(site))
+    [virtual_host] = apache_virtual_hosts(str(tmp_path / 'apache2.conf'))
+    return virtual_host
+
+
+SITE = """
+    <VirtualHost *:80>
+        ServerName example.com
+        DocumentRoot /var/www/html
+        %s
+    </VirtualHost>
+"""
+
+
+def test_apache_server_level_php_handler_is_a_backend(tmp_path):
+    virtual_host = _apache_host(tmp_path, SITE % "", DEBIAN_PHP_FPM_CONF)
+    assert virtual_host["backend"]
+    assert not virtual_host["hides_powered_by"]
+
+
+def test_apache_header_unset_hides_server_level_backend(tmp_path):
+    virtual_host = _apache_host(tmp_path, SITE % "Header always unset X-Powered-By", DEBIAN_PHP_FPM_CONF)
+    assert virtual_host["backend"]
+    assert virtual_host["hides_powered_by"]
+
+
+def test_apache_static_site_has_no_backend(tmp_path):
+    virtual_host = _apache_host(tmp_path, SITE % "")
+    assert not virtual_host["backend"]
+
+
+def test_apache_virtual_host_proxy_pass_is_a_backend(tmp_path):
+    virtual_host = _apache_host(tmp_path, SITE % "ProxyPass / http://127.0.0.1:8080/")
+    assert virtual_host["backend"]
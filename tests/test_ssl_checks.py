@@ -0,0 +1,145 @@
+import socket
+import ssl
+
+from checks.ssl_checks import SSLChecker, WEAK_CIPHER_SUITES
+from utils.host_facts import HostFacts
+
+
+def _server_context(cert, minimum=ssl.TLSVersion.TLSv1_2, ciphers=None):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.minimum_version = minimum
+    if ciphers:
+        # Lower the security level before loading a small key
+        context.set_ciphers(ciphers)
+    context.load_cert_chain(*cert)
+    return context
+
+
+def _facts(**overrides):
+    facts = {
+        "negotiated_protocol": "TLSv1.3",
+        "negotiated_cipher": "TLS_AES_256_GCM_SHA384",
+        "certificate": {"key_type": "RSA", "key_size": 2048,
+                        "signature_algorithm": "sha256WithRSAEncryption"},
+        "chain_error": None,
+        "hsts_max_age": None,
+        "protocols": {"TLSv1": False, "TLSv1.1": False, "TLSv1.2": True, "TLSv1.3": True},
+        "untested_protocols": [],
+        "weak_ciphers": [],
+        "untested_ciphers": [],
+    }
+    facts.update(overrides)
+    return facts
+
+
+def test_self_signed_server_is_not_trusted(make_certificate, tls_server):
+    domain = tls_server(_server_context(make_certificate('self-signed')))
+    facts = SSLChecker({}).probe_tls(domain)
+
+    assert facts["certificate"]["key_size"] == 2048
+    assert facts["protocols"]["TLSv1.2"] and not facts["protocols"]["TLSv1"]
+    assert facts["weak_ciphers"] == []
+    grade, reasons = SSLChecker.grade_tls(facts)
+    assert grade == 'F'
+    assert any("not trusted" in reason for reason in reasons)
+
+
+def test_weak_server_caps_grade(make_certificate, tls_server):
+    cert = make_certificate('weak', bits=1024)
+    domain = tls_server(_server_context(cert, ssl.TLSVersion.TLSv1, 'ALL:@SECLEVEL=0'))
+    facts = SSLChecker({}).probe_tls(domain)
+
+    assert facts["certificate"]["key_size"] == 1024
+    grade, reasons = SSLChecker.grade_tls(facts)
+    assert grade == 'F'
+    assert "RSA key is only 1024 bits" in reasons
+    if facts["protocols"]["TLSv1"] or facts["protocols"]["TLSv1.1"]:
+        assert "TLS 1.0/1.1 is enabled" in reasons
+
+
+def test_legacy_only_server_is_graded(make_certificate, tls_server):
+    context = _server_context(make_certificate('legacy'), ssl.TLSVersion.TLSv1, 'DEFAULT:@SECLEVEL=0')
+    context.maximum_version = ssl.TLSVersion.TLSv1_1
+    domain = tls_server(context)
+    checker = SSLChecker({})
+    facts = checker.probe_tls(domain)
+
+    assert facts["protocols"] == {"TLSv1": True, "TLSv1.1": True, "TLSv1.2": False, "TLSv1.3": False}
+    assert facts["negotiated_protocol"] == "TLSv1.1"
+    assert facts["chain_error"]["code"] is None
+    grade, reasons = SSLChecker.grade_tls(facts)
+    assert grade == 'C'
+    assert "neither TLS 1.2 nor TLS 1.3 is supported" in reasons
+    assert any(reason.startswith("certificate chain could not be verified") for reason in reasons)
+
+    result = checker.check_ssl_certificate_expiry(domain)
+    assert result["passed"]
+
+
+def test_weak_ciphers_probed_on_every_enabled_protocol(make_certificate, tls_server, monkeypatch):
+    cert = make_certificate('weak-protocols', bits=1024)
+    domain = tls_server(_server_context(cert, ssl.TLSVersion.TLSv1, 'ALL:@SECLEVEL=0'))
+    probed = []
+    probe_context = SSLChecker._probe_context
+
+    def recording_context(version=None, ciphers='ALL:@SECLEVEL=0'):
+        probed.append((version, ciphers))
+        return probe_context(version, ciphers)
+
+    monkeypatch.setattr(SSLChecker, '_probe_context', staticmethod(recording_context))
+    facts = SSLChecker({}).probe_tls(domain)
+
+    enabled = [name for name, accepted in facts["protocols"].items()
+               if accepted and name != 'TLSv1.3']
+    cipher_versions = {version for version, ciphers in probed
+                       if ciphers.startswith(tuple(WEAK_CIPHER_SUITES.values()))}
+    assert len(cipher_versions) == len(enabled) > 1
+
+
+def test_unofferable_cipher_classes_are_untested_not_refused(make_certificate, tls_server):
+    domain = tls_server(_server_context(make_certificate('modern')))
+    facts = SSLChecker({}).probe_tls(domain)
+
+    # EXPORT suites no longer exist in OpenSSL, so they can never be offered
+    assert "EXPORT" in facts["untested_ciphers"]
+    assert "EXPORT" not in facts["weak_ciphers"]
+    grade, reasons = SSLChecker.grade_tls(facts)
+    assert any("could not be tested" in reason and "EXPORT" in reason for reason in reasons)
+
+
+def test_accepts_distinguishes_client_limits_from_refusal():
+    checker = SSLChecker({})
+
+    def unofferable():
+        raise ssl.SSLError("No cipher can be selected")
+
+    assert checker._accepts('127.0.0.1:1', unofferable, 1) is None
+    assert checker._accepts('127.0.0.1:1', SSLChecker._probe_context, 1) is False
+
+
+def test_untested_classes_are_reported_without_capping_grade():
+    grade, reasons = SSLChecker.grade_tls(_facts(untested_ciphers=["RC4", "3DES"],
+                                                 untested_protocols=["TLSv1"]))
+    assert grade == 'A'
+    assert "TLSv1 could not be tested with the local OpenSSL" in reasons
+    assert "RC4, 3DES cipher suites could not be tested with the local OpenSSL" in reasons
+
+
+def test_accepted_weak_ciphers_cap_grade():
+    assert SSLChecker.grade_tls(_facts(weak_ciphers=["RC4"]))[0] == 'C'
+    assert SSLChecker.grade_tls(_facts(weak_ciphers=["NULL"]))[0] == 'F'
+
+
+def test_probe_error_is_replayed_from_snapshot(tmp_path):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        domain = f"127.0.0.1:{sock.getsockname()[1]}"
+    live = SSLChecker({})
+    live_result = live.check_ssl_grade(domain)
+    assert not live_result["passed"]
+
+    path = str(tmp_path / 'host.json.gz')
+    live.facts.save(path)
+    offline = SSLChecker({})
+    offline.facts = HostFacts.load(path)
+    assert offline.check_ssl_grade(domain)["message"] == live_result["message"]
@@ -11,7 +11,12 @@ class ConfigLoader:
                 "authorized_public_keys": []
             },
             "web_server": {
-                "target_urls": ["http://localhost"]
+                "target_urls": ["http://localhost"],
+                "analyze_config": True,
+                "server_configs": {
+                    "nginx": ["/etc/nginx/nginx.conf"],
+                    "apache": ["/etc/apache2/apache2.conf", "/etc/httpd/conf/httpd.conf"]
+                }
             },
             "ssl": {
                 "domains": ["localhost"]
@@ -33,6 +38,67 @@ class ConfigLoader:
             "cloudflare": {
                 "check_proxy": True,
                 "expected_headers": ["cf-ray", "cf-cache-status"]
+            },
+            "exposure": {
+                "paths": [
+                    "/.git/HEAD",
+                    "/.git/config",
+                    "/.env",
+                    "/.svn/entries",
+                    "/.htpasswd",
+                    "/phpinfo.php",
+                    "/info.php",
+                    "/test.php",
+                    "/server-status",
+                    "/server-info",
+                    "/backup.zip",
+                    "/backup.tar.gz",
+                    "/backup.sql",
+                    "/dump.sql",
+                    "/database.sql",
+                    "/wp-config.php.bak",
+                    "/config.php.bak",
+                    "/.DS_Store"
+                ],
+                "max_workers": 8,
+                "requests_per_second": 5,
+                "timeout": 5
+            },
+            "exporter": {
+                "listen": "127.0.0.1:9877",
+                "interval": 300
+            },
+            "history": {
+                "path": "reports/history.db"
+            },
+            "scan": {
+                "jobs": 1,
+                "shard_size": 256,
+                "follow_symlinks": False,
+                "exclude": {
+                    "patterns": [
+                        "node_modules/",
+                        "vendor/",
+                        "bower_components/",
+                        "__pycache__/",
+                        ".cache/",
+                        "**/.git/**",
+                        "**/wp-content/uploads/",
+                        "**/storage/framework/cache/"
+                    ],
+                    "max_file_size": 10485760,
+                    "skip_binary": True
+                },
+                "budget": {
+                    "enabled": False,
+                    "files_per_second": 200,
+                    "bytes_per_second": 5242880,
+                    "cpu_share": 0.25,
+                    "max_load_per_cpu": 0.7,
+                    "max_pressure": 10.0,
+                    "max_walk_seconds": 0,
+                    "checkpoint_file": "reports/scan_checkpoint.json"
+                }
             }
         }
         
@@ -0,0 +1,33 @@
+class ConnectionPool:
+    """Keeps one open DB-API connection per database server"""
+
+    def __init__(self):
+        self._connections = {}
+
+    def get(self, key, connect):
+        """Return the pooled connection for key, opening it on first use"""
+        if key not in self._connections:
+            self._connections[key] = connect()
+        return self._connections[key]
+
+    def run_queries(self, key, connect, queries):
+        """Run a batch of named queries on one cursor and return their rows"""
+        connection = self.get(key, connect)
+        cursor = connection.cursor()
+        try:
+            rows = {}
+            for name, query in queries:
+                cursor.execute(query)
+                rows[name] = cursor.fetchall()
+            return rows
+        finally:
+            cursor.close()
+
+    def close_all(self):
+        """Close every pooled connection"""
+        for connection in self._connections.values():
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self._connections = {}
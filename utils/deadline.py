@@ -0,0 +1,20 @@
+import time
+
+
+class Deadline:
+    """A wall-clock time budget that can be divided between remaining work"""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """Seconds left in the budget"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def share(self, parts):
+        """Fair share of the remaining time for the next of `parts` pieces of work"""
+        return self.remaining() / max(1, parts)
+
+    def child(self, parts):
+        """A deadline for the next of `parts` pieces of work"""
+        return Deadline(self.share(parts))
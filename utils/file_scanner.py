@@ -0,0 +1,353 @@
+import fnmatch
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.scan_budget import ScanBudget
+from utils.scan_filter import ScanFilter
+
+
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+def _name_matches(name, patterns):
+    """Return True if a file name matches any find(1)-style -name pattern"""
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def _file_matches(path, regexes, skip_binary=False):
+    """Return True if any regex matches a line of the file, like grep -l
+
+    Returns None without searching if skip_binary is set and the file
+    looks binary.
+    """
+    try:
+        with open(path, 'rb') as f:
+            remainder = b''
+            block = f.read(READ_BLOCK_SIZE)
+            if skip_binary and ScanFilter.is_binary(block):
+                return None
+            while True:
+                if not block:
+                    data = remainder
+                else:
+                    # Only search complete lines so a match never spans blocks
+                    data = remainder + block
+                    cut = data.rfind(b'\n')
+                    if cut == -1:
+                        remainder = data
+                        block = f.read(READ_BLOCK_SIZE)
+                        continue
+                    data, remainder = data[:cut + 1], data[cut + 1:]
+
+                if any(regex.search(data) for regex in regexes):
+                    return True
+                if not block:
+                    return False
+                block = f.read(READ_BLOCK_SIZE)
+    except OSError:
+        return False
+
+
+def _compile_rules(rules, ignore_case):
+    """Compile the content regex of each (name_patterns, regex) rule"""
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return [(patterns, re.compile(regex.encode(), flags))
+            for patterns, regex in rules]
+
+
+def _path_matches(path, compiled, skip_binary=False):
+    """Grep one file with the rules whose name patterns apply to it"""
+    name = os.path.basename(path)
+    regexes = [regex for patterns, regex in compiled
+               if _name_matches(name, patterns)]
+    return bool(regexes) and _file_matches(path, regexes, skip_binary)
+
+
+def _scan_shard(shard, rules, ignore_case, skip_binary=False):
+    """Grep one shard of (path, size) pairs; runs inside a worker process
+
+    Returns the matching paths and the number and size of binary files skipped.
+    """
+    compiled = _compile_rules(rules, ignore_case)
+    matches, binary_files, binary_bytes = [], 0, 0
+    for path, size in shard:
+        matched = _path_matches(path, compiled, skip_binary)
+        if matched is None:
+            binary_files += 1
+            binary_bytes += size
+        elif matched:
+            matches.append(path)
+    return matches, binary_files, binary_bytes
+
+
+class FileScanner:
+    """Walks web roots and greps file contents, optionally across processes"""
+
+    def __init__(self, jobs=1, shard_size=256, shard_bytes=64 * 1024 * 1024,
+                 budget=None, checkpoint_file=None, is_cancelled=None,
+                 scan_filter=None, follow_symlinks=False, track_workers=None):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.shard_bytes = shard_bytes
+        self.budget = budget
+        self.checkpoint_file = checkpoint_file
+        self.is_cancelled = is_cancelled
+        self.track_workers = track_workers
+        self.scan_filter = scan_filter or ScanFilter()
+        self.follow_symlinks = follow_symlinks
+        self.complete = True
+        self.pending = 0
+        self.skipped = {"directories": 0, "files": 0, "bytes": 0}
+
+    @classmethod
+    def from_config(cls, config, is_cancelled=None, track_workers=None):
+        """Build a scanner from the 'scan' section of the configuration"""
+        scan_config = config.get('scan', {})
+        budget_config = scan_config.get('budget', {})
+        budget = ScanBudget.from_config(budget_config)
+        checkpoint_file = None
+        if budget and budget.max_walk_seconds:
+            checkpoint_file = budget_config.get(
+                'checkpoint_file', 'reports/scan_checkpoint.json')
+        return cls(jobs=scan_config.get('jobs', 1),
+                   shard_size=scan_config.get('shard_size', 256),
+                   budget=budget, checkpoint_file=checkpoint_file,
+                   is_cancelled=is_cancelled, track_workers=track_workers,
+                   scan_filter=ScanFilter.from_config(scan_config.get('exclude', {})),
+                   follow_symlinks=scan_config.get('follow_symlinks', False))
+
+    def _load_checkpoints(self):
+        """Read all saved walk checkpoints"""
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _resume(self, key):
+        """Return the saved state for a walk, or a fresh one"""
+        self.complete = True
+        self.pending = 0
+        self.skipped = {"directories": 0, "files": 0, "bytes": 0}
+        if self.budget:
+            self.budget.start_walk()
+        if self.checkpoint_file:
+            state = self._load_checkpoints().get(key)
+            if state:
+                return state
+        return {'matches': []}
+
+    def _finish(self, key, state, matches):
+        """Save or clear the checkpoint for a walk and return its matches"""
+        matches = sorted(matches)
+        self.pending = len(state.get('pending', []))
+        self.complete = not self.pending
+        if self.checkpoint_file:
+            checkpoints = self._load_checkpoints()
+            if self.complete:
+                checkpoints.pop(key, None)
+            else:
+                checkpoints[key] = {'pending': state['pending'], 'partial': state.get('partial'),
+                                    'matches': matches}
+            if os.path.dirname(self.checkpoint_file):
+                os.makedirs(os.path.dirname(self.checkpoint_file), exist_ok=True)
+            with open(self.checkpoint_file, 'w') as f:
+                json.dump(checkpoints, f)
+        return matches
+
+    def scan_details(self):
+        """Result details describing what the last walk skipped"""
+        return {"skipped_directories": self.skipped["directories"],
+                "skipped_files": self.skipped["files"],
+                "skipped_bytes": self.skipped["bytes"]}
+
+    def pause_message(self):
+        """Describe a walk that paused before finishing"""
+        return (f"Scan paused after {self.budget.max_walk_seconds}s with "
+                f"{self.pending} directories pending; it resumes on the next run")
+
+    @staticmethod
+    def _unique_roots(roots):
+        """Drop missing roots and roots nested inside another root"""
+        existing = sorted({os.path.realpath(root)
+                           for root in roots if os.path.isdir(root)})
+        unique = []
+        for root in existing:
+            if not any(root.startswith(parent + os.sep) for parent in unique):
+                unique.append(root)
+        return unique
+
+    def walk(self, roots, state=None):
+        """Yield (path, is_dir, size) for every entry below the roots
+
+        The stack of directories still to visit is kept in state['pending'],
+        so a walk stopped by the budget window can be resumed later. The
+        window is also checked between the entries of a directory, which are
+        visited in name order: a walk paused part way through one records the
+        last name done in state['partial'] and resumes after it.
+        Excluded directories are pruned rather than visited, and directories
+        reached twice through symlinks or bind mounts are only walked once.
+        """
+        if state is None:
+            state = {}
+        roots = self._unique_roots(roots)
+        if 'pending' not in state:
+            state['pending'] = list(reversed(roots))
+        stack = state['pending']
+        follow = self.follow_symlinks
+        visited = set()
+
+        while stack:
+            if self._should_pause():
+                return
+            directory = stack.pop()
+            resume_after = None
+            if state.get('partial') and state['partial'][0] == directory:
+                resume_after = state.pop('partial')[1]
+            try:
+                directory_stat = os.stat(directory)
+            except OSError:
+                continue
+            identity = (directory_stat.st_dev, directory_stat.st_ino)
+            if identity in visited:
+                continue
+            visited.add(identity)
+
+            root = next((root for root in roots if directory == root
+                         or directory.startswith(root + os.sep)), directory)
+            prefix = directory[len(root) + 1:].replace(os.sep, '/')
+            try:
+                with os.scandir(directory) as listing:
+                    entries = sorted(listing, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            for entry in entries:
+                if resume_after is not None and entry.name <= resume_after:
+                    continue
+                if self._should_pause():
+                    stack.append(directory)
+                    if resume_after is not None:
+                        state['partial'] = [directory, resume_after]
+                    return
+                resume_after = entry.name
+                if self.budget:
+                    self.budget.charge(files=1)
+                relative_path = f"{prefix}/{entry.name}" if prefix else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=follow):
+                        if self.scan_filter.excluded(relative_path, True):
+                            self.skipped["directories"] += 1
+                            continue
+                        stack.append(entry.path)
+                        yield entry.path, True, 0
+                    elif entry.is_file(follow_symlinks=follow):
+                        size = entry.stat(follow_symlinks=follow).st_size
+                        if self.scan_filter.excluded(relative_path, False):
+                            self.skipped["files"] += 1
+                            self.skipped["bytes"] += size
+                            continue
+                        yield entry.path, False, size
+                except OSError:
+                    continue
+
+    def _should_pause(self):
+        """True once the budget window has expired or the check was cancelled"""
+        if self.budget and self.budget.window_expired():
+            return True
+        return bool(self.is_cancelled and self.is_cancelled())
+
+    @staticmethod
+    def _scan_key(*parts):
+        """Identify a walk so its checkpoint can be found again"""
+        return json.dumps(parts, sort_keys=True)
+
+    def find_files(self, roots, name_patterns, file_type=None):
+        """Return sorted paths whose name matches any pattern (find -name)"""
+        key = self._scan_key('find', sorted(roots), list(name_patterns), file_type)
+        state = self._resume(key)
+        found = set(state['matches'])
+        for path, is_dir, size in self.walk(roots, state):
+            if file_type == 'f' and is_dir or file_type == 'd' and not is_dir:
+                continue
+            if _name_matches(os.path.basename(path), name_patterns):
+                found.add(path)
+        return self._finish(key, state, found)
+
+    def _build_shards(self, files):
+        """Split (path, size) pairs into shards, largest files first"""
+        shards = []
+        current, current_bytes = [], 0
+        for path, size in sorted(files, key=lambda item: (-item[1], item[0])):
+            current.append((path, size))
+            current_bytes += size
+            if len(current) >= self.shard_size or current_bytes >= self.shard_bytes:
+                shards.append(current)
+                current, current_bytes = [], 0
+        if current:
+            shards.append(current)
+        return shards
+
+    def grep_files(self, roots, rules, ignore_case=False):
+        """Return sorted paths matching any (name_patterns, regex) rule"""
+        rules = [([patterns] if isinstance(patterns, str) else list(patterns), regex)
+                 for patterns, regex in rules]
+        all_patterns = [pattern for patterns, _ in rules for pattern in patterns]
+        key = self._scan_key('grep', sorted(roots), rules, ignore_case)
+        state = self._resume(key)
+        matches = set(state['matches'])
+
+        candidates = self._grep_candidates(roots, state, all_patterns)
+        skip_binary = self.scan_filter.skip_binary
+
+        if self.budget or self.jobs <= 1:
+            # Budgeted scans stay on one core and grep as they walk, so the
+            # byte budget applies and a paused walk keeps what it found
+            compiled = _compile_rules(rules, ignore_case)
+            for path, size in candidates:
+                matched = _path_matches(path, compiled, skip_binary)
+                if matched is None:
+                    self._skip_file(size)
+                elif matched:
+                    matches.add(path)
+                if self.budget:
+                    self.budget.charge(nbytes=size)
+            return self._finish(key, state, matches)
+
+        shards = self._build_shards(candidates)
+        if len(shards) <= 1:
+            outcomes = [_scan_shard(shard, rules, ignore_case, skip_binary) for shard in shards]
+        else:
+            # Shards are handed out one at a time, so idle workers pick up the
+            # next shard while others are still busy with large files
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(shards))) as pool:
+                futures = [pool.submit(_scan_shard, shard, rules, ignore_case, skip_binary)
+                           for shard in shards]
+                # Workers have started by now; a cancelled check kills them
+                if self.track_workers:
+                    self.track_workers(list(pool._processes.values()))
+                outcomes = [future.result() for future in as_completed(futures)]
+
+        for shard_matches, binary_files, binary_bytes in outcomes:
+            matches.update(shard_matches)
+            self.skipped["files"] += binary_files
+            self.skipped["bytes"] += binary_bytes
+
+        return self._finish(key, state, matches)
+
+    def _skip_file(self, size):
+        """Count a file left out of a content scan"""
+        self.skipped["files"] += 1
+        self.skipped["bytes"] += size
+
+    def _grep_candidates(self, roots, state, name_patterns):
+        """Yield (path, size) of files to grep, leaving out those over the size limit"""
+        for path, is_dir, size in self.walk(roots, state):
+            if is_dir or not _name_matches(os.path.basename(path), name_patterns):
+                continue
+            if self.scan_filter.too_large(size):
+                self._skip_file(size)
+                continue
+            yield path, size
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+from datetime import datetime
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    started_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_host_time ON runs (host, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_time ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    check_name TEXT NOT NULL,
+    target TEXT NOT NULL,
+    UNIQUE (category, check_name, target)
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    check_id INTEGER NOT NULL REFERENCES checks (id),
+    passed INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    message_id INTEGER NOT NULL REFERENCES messages (id),
+    PRIMARY KEY (run_id, check_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_results_check ON results (check_id, run_id);
+"""
+
+
+class HistoryStore:
+    """SQLite store of past runs, used to report only what changed"""
+
+    def __init__(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+        self._check_ids = {}
+        self._message_ids = {}
+
+    def _migrate(self):
+        """Add the status column to a history written before it existed"""
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(results)")]
+        if 'status' not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE results ADD COLUMN status TEXT NOT NULL DEFAULT ''")
+                self.connection.execute(
+                    "UPDATE results SET status = CASE passed WHEN 1 THEN 'PASS' ELSE 'FAIL' END")
+
+    @staticmethod
+    def result_key(result):
+        """Identity of a check across runs"""
+        return (result.get('category', 'Other'), result['check_name'], result.get('target') or '')
+
+    @staticmethod
+    def result_status(result):
+        """PASS, FAIL or TIMEOUT for a result"""
+        if result.get('status') == 'TIMEOUT':
+            return "TIMEOUT"
+        return "PASS" if result['passed'] else "FAIL"
+
+    def _intern(self, cache, select, insert, key):
+        """Return the id of a de-duplicated row, inserting it if needed"""
+        if key not in cache:
+            row = self.connection.execute(select, key).fetchone()
+            cache[key] = row[0] if row else self.connection.execute(insert, key).lastrowid
+        return cache[key]
+
+    def latest_results(self, host):
+        """Return {key: (status, message)} from the host's most recent run"""
+        row = self.connection.execute(
+            "SELECT id FROM runs WHERE host = ? ORDER BY started_at DESC, id DESC LIMIT 1",
+            (host,)).fetchone()
+        if not row:
+            return None
+
+        rows = self.connection.execute(
+            "SELECT c.category, c.check_name, c.target, r.status, m.text "
+            "FROM results r JOIN checks c ON c.id = r.check_id "
+            "JOIN messages m ON m.id = r.message_id WHERE r.run_id = ?",
+            (row[0],))
+        return {(category, check_name, target): (status, message)
+                for category, check_name, target, status, message in rows}
+
+    def record_run(self, host, results, started_at=None):
+        """Store one run's results and return its id"""
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (host, started_at) VALUES (?, ?)",
+                (host, started_at or datetime.now().isoformat())).lastrowid
+
+            rows = []
+            for result in results:
+                check_id = self._intern(
+                    self._check_ids,
+                    "SELECT id FROM checks WHERE category = ? AND check_name = ? AND target = ?",
+                    "INSERT INTO checks (category, check_name, target) VALUES (?, ?, ?)",
+                    self.result_key(result))
+                message_id = self._intern(
+                    self._message_ids,
+                    "SELECT id FROM messages WHERE text = ?",
+                    "INSERT INTO messages (text) VALUES (?)",
+                    (str(result['message']),))
+                rows.append((run_id, check_id, int(bool(result['passed'])), self.result_status(result),
+                             result.get('severity', 'medium'), message_id))
+
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (run_id, check_id, passed, status, severity, message_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return run_id
+
+    @classmethod
+    def changed_results(cls, previous, results):
+        """Return results whose status or message differ from the previous run"""
+        if previous is None:
+            return [dict(result, change="new") for result in results]
+
+        changed = []
+        for result in results:
+            before = previous.get(cls.result_key(result))
+            if before is None:
+                changed.append(dict(result, change="new"))
+            elif before != (cls.result_status(result), str(result['message'])):
+                changed.append(dict(result, change="changed", previous_status=before[0],
+                                    previous_passed=before[0] == "PASS"))
+        return changed
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
@@ -0,0 +1,212 @@
+import gzip
+import json
+import os
+import shutil
+import socket
+import subprocess
+from datetime import datetime
+
+from utils.server_config import find_virtual_hosts
+from utils.x509 import load_pem_certificates, parse_certificate
+
+
+SNAPSHOT_VERSION = 2
+
+
+class FactNotCollected(Exception):
+    """Raised when a snapshot lacks a fact a check asks for"""
+
+
+class CollectionFailed(Exception):
+    """Raised for a fact whose collection failed; the message is the original error"""
+
+
+def _proc_address(hex_address):
+    """Decode a little-endian /proc/net address into its textual form"""
+    raw = bytes.fromhex(hex_address)
+    raw = b''.join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    family = socket.AF_INET if len(raw) == 4 else socket.AF_INET6
+    return socket.inet_ntop(family, raw)
+
+
+def _read_file(path):
+    """File contents, or None if it does not exist"""
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _stat(path):
+    """Mode and ownership of a path, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return {"mode": st.st_mode, "uid": st.st_uid, "gid": st.st_gid, "size": st.st_size}
+
+
+def _service_active(service, process):
+    """True if the service's process is running, from /proc or systemctl"""
+    if os.path.isdir('/proc'):
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f'/proc/{pid}/comm', 'r') as f:
+                    if f.read().strip() == process:
+                        return True
+            except OSError:
+                continue
+        return False
+
+    completed = subprocess.run(['systemctl', 'is-active', service],
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return completed.returncode == 0 and completed.stdout.strip() == 'active'
+
+
+def _certificate_file(path):
+    """Parsed leaf certificate of a PEM file, or None if it holds none"""
+    certificates = load_pem_certificates(path)
+    return parse_certificate(certificates[0]) if certificates else None
+
+
+def _listeners():
+    """[address, port] of every listening TCP socket, or None if unavailable"""
+    if not os.path.isdir('/proc/net'):
+        try:
+            completed = subprocess.run(['netstat', '-tln'], stdout=subprocess.PIPE,
+                                       stderr=subprocess.DEVNULL, text=True)
+        except OSError:
+            return None
+        if completed.returncode != 0:
+            return None
+        listeners = []
+        for line in completed.stdout.splitlines():
+            fields = line.split()
+            if 'LISTEN' in fields:
+                address, _, port = fields[3].rpartition(':')
+                listeners.append([address, int(port)])
+        return listeners
+
+    listeners = []
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table, 'r') as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    # State 0A is TCP_LISTEN
+                    if fields[3] != '0A':
+                        continue
+                    address, port = fields[1].split(':')
+                    listeners.append([_proc_address(address), int(port, 16)])
+        except (OSError, StopIteration):
+            continue
+    return listeners
+
+
+class HostFacts:
+    """Raw host data that checks evaluate, read live or replayed from a snapshot
+
+    Every fact is cached under a 'kind:key' name the first time a check asks
+    for it, so one live run reads each file or probes each domain once and the
+    cache itself is the snapshot that --collect writes out.
+    """
+
+    def __init__(self, facts=None, live=True, host=None, collected_at=None):
+        self.facts = facts if facts is not None else {}
+        self.live = live
+        self.host = host or socket.gethostname()
+        self.collected_at = collected_at
+
+    @classmethod
+    def load(cls, path):
+        """Open a snapshot written by save() for offline evaluation"""
+        with gzip.open(path, 'rt') as f:
+            snapshot = json.load(f)
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version in {path}: {snapshot.get('version')}")
+        return cls(snapshot['facts'], live=False, host=snapshot['host'],
+                   collected_at=snapshot['collected_at'])
+
+    def save(self, path):
+        """Write the collected facts as a compressed snapshot"""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "host": self.host,
+            "collected_at": self.collected_at or datetime.now().isoformat(),
+            "facts": self.facts,
+        }
+        with gzip.open(path, 'wt') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+
+    def get(self, kind, key, collect):
+        """Return a fact, collecting it live on first use"""
+        name = f"{kind}:{key}"
+        if name in self.facts:
+            return self.facts[name]
+        if not self.live:
+            raise FactNotCollected(f"{name} was not collected in the snapshot of {self.host}")
+        value = collect()
+        self.facts[name] = value
+        return value
+
+    def _get_or_failure(self, kind, key, collect, failures):
+        """get(), caching a failed collection so a snapshot replays the same error"""
+        def collect_failure():
+            try:
+                return collect()
+            except failures as e:
+                return {"error": str(e)}
+
+        value = self.get(kind, key, collect_failure)
+        if isinstance(value, dict) and 'error' in value:
+            raise CollectionFailed(value['error'])
+        return value
+
+    def read_file(self, path):
+        """Contents of a file, or None if it does not exist"""
+        return self.get('file', path, lambda: _read_file(path))
+
+    def stat(self, path):
+        """{mode, uid, gid, size} of a path, or None if it does not exist"""
+        return self.get('stat', path, lambda: _stat(path))
+
+    def which(self, command):
+        """Path of a command on PATH, or None"""
+        return self.get('which', command, lambda: shutil.which(command))
+
+    def service_active(self, service, process):
+        """True if a service is running"""
+        return self.get('service', service, lambda: _service_active(service, process))
+
+    def listeners(self):
+        """[address, port] of every listening TCP socket, or None if unavailable"""
+        return self.get('listeners', 'tcp', _listeners)
+
+    def scan(self, scanner, operation, roots, *args):
+        """(matches, skip counts) of scanner.find_files or scanner.grep_files
+
+        Paused walks are not cached, so a snapshot only holds complete scans.
+        """
+        key = json.dumps([operation, sorted(roots)] + list(args))
+        if self.live and f"scan:{key}" not in self.facts:
+            matches = getattr(scanner, operation)(roots, *args)
+            if not scanner.complete:
+                return matches, scanner.scan_details()
+            self.facts[f"scan:{key}"] = [matches, scanner.scan_details()]
+        matches, details = self.get('scan', key, None)
+        return matches, details
+
+    def virtual_hosts(self, config_files):
+        """Virtual host summaries of the nginx/Apache config trees"""
+        return self._get_or_failure('vhosts', json.dumps(config_files, sort_keys=True),
+                                    lambda: find_virtual_hosts(config_files), (OSError, ValueError))
+
+    def certificate_file(self, path):
+        """Parsed leaf certificate of a PEM file, or None if it holds none"""
+        return self._get_or_failure('certificate', path, lambda: _certificate_file(path), Exception)
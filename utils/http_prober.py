@@ -0,0 +1,192 @@
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+
+# Content that confirms a path really is the sensitive file, not an error page
+PATH_SIGNATURES = {
+    '/.git/HEAD': rb'^(ref: refs/|[0-9a-f]{40})',
+    '/.git/config': rb'\[core\]',
+    '/.env': rb'(?m)^[A-Z][A-Z0-9_]*=',
+    '/.svn/entries': rb'^(\d+\s|<\?xml)',
+    '/.htpasswd': rb'(?m)^[^:\s]+:\S+',
+    '/phpinfo.php': rb'phpinfo\(\)|PHP Version',
+    '/info.php': rb'phpinfo\(\)|PHP Version',
+    '/server-status': rb'Server Status',
+    '/server-info': rb'Server Information',
+}
+
+PREFIX_BYTES = 1024
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class ProbeCancelled(requests.RequestException):
+    """Raised instead of sending a request once the probing check was cancelled"""
+
+
+class HostUnreachable(requests.RequestException):
+    """Raised instead of sending a request to an endpoint that already refused a connection"""
+
+
+def _endpoint(url):
+    """(scheme, hostname, port) a URL connects to"""
+    parts = urlsplit(url)
+    return parts.scheme, parts.hostname, parts.port or DEFAULT_PORTS.get(parts.scheme)
+
+
+class HostRateLimiter:
+    """Spaces out requests so each host sees at most N requests per second"""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        """Block until the next request slot for host"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HTTPProber:
+    """Concurrently requests a wordlist of sensitive paths on each base URL"""
+
+    def __init__(self, paths, max_workers=8, requests_per_second=5, timeout=5):
+        self.paths = paths
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(requests_per_second)
+        self._local = threading.local()
+        self._unreachable = {}
+
+    def _session(self):
+        """Return a requests session owned by the current thread"""
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+            self._local.session.verify = False
+        return self._local.session
+
+    def _check_request(self, endpoint, url, is_cancelled):
+        """Raise instead of requesting url once the check or its endpoint is gone"""
+        if is_cancelled():
+            raise ProbeCancelled(f"Cancelled before requesting {url}")
+        if endpoint in self._unreachable:
+            raise HostUnreachable(self._unreachable[endpoint]["error"])
+
+    def _request(self, method, url, is_cancelled, **kwargs):
+        """Issue one rate-limited request without following redirects
+
+        The first connection failure marks the scheme, host and port
+        unreachable, so the rest of its wordlist fails fast instead of
+        queueing behind the limiter. http:// and https:// on one host are
+        separate endpoints: a failing TLS port says nothing about port 80.
+        """
+        endpoint = _endpoint(url)
+        self._check_request(endpoint, url, is_cancelled)
+        self.limiter.wait(urlsplit(url).netloc)
+        # The rate limiter may have slept well past the check's deadline
+        self._check_request(endpoint, url, is_cancelled)
+        try:
+            return self._session().request(method, url, allow_redirects=False,
+                                           timeout=self.timeout, **kwargs)
+        except requests.ConnectionError as e:
+            # The summary leaves out the URL, which for the baseline request is random
+            scheme, hostname, port = endpoint
+            self._unreachable.setdefault(endpoint, {
+                "error": f"{type(e).__name__} connecting to {hostname}:{port}",
+                "detail": str(e),
+            })
+            raise
+
+    def _fetch_prefix(self, url, is_cancelled):
+        """Ranged GET of the first bytes of a resource"""
+        response = self._request('GET', url, is_cancelled, stream=True,
+                                 headers={'Range': f'bytes=0-{PREFIX_BYTES - 1}'})
+        try:
+            prefix = response.raw.read(PREFIX_BYTES, decode_content=True) or b''
+        finally:
+            response.close()
+        return response.status_code, prefix
+
+    @staticmethod
+    def _content_length(response):
+        """Full resource length from Content-Range or Content-Length"""
+        content_range = response.headers.get('Content-Range', '')
+        if '/' in content_range:
+            return content_range.rsplit('/', 1)[1]
+        return response.headers.get('Content-Length')
+
+    def _baseline(self, base_url, is_cancelled):
+        """Probe a random path to learn how the host answers for missing files"""
+        url = f"{base_url}/{uuid.uuid4().hex}"
+        try:
+            head = self._request('HEAD', url, is_cancelled)
+            if not 200 <= head.status_code < 300:
+                return None
+            _, prefix = self._fetch_prefix(url, is_cancelled)
+            return {'length': self._content_length(head), 'prefix': prefix}
+        except requests.RequestException:
+            return None
+
+    def _probe(self, base_url, path, baseline, is_cancelled):
+        """Return True if path is served with real content"""
+        url = f"{base_url}{path}"
+        try:
+            head = self._request('HEAD', url, is_cancelled)
+            if head.status_code != 405 and not 200 <= head.status_code < 300:
+                return False
+            # Soft-404: same size as the page served for a random path
+            if baseline and baseline['length'] is not None and \
+                    self._content_length(head) == baseline['length']:
+                return False
+
+            status, prefix = self._fetch_prefix(url, is_cancelled)
+            if not 200 <= status < 300:
+                return False
+            if baseline and prefix == baseline['prefix']:
+                return False
+
+            signature = PATH_SIGNATURES.get(path)
+            return signature is None or re.search(signature, prefix) is not None
+        except requests.RequestException:
+            return False
+
+    def probe(self, base_urls, is_cancelled=lambda: False):
+        """Return ({base_url: [exposed paths]}, {base_url: {error, detail}})
+
+        A base URL whose endpoint could not be connected to appears in the
+        second dict, since its empty path list proves nothing: error is a
+        summary that stays the same from run to run, detail the exception text. is_cancelled is polled
+        before every request, so a probe abandoned by its check's deadline
+        stops instead of working through the wordlist.
+        """
+        base_urls = [url.rstrip('/') for url in base_urls]
+        self._unreachable = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            baselines = dict(zip(base_urls, pool.map(
+                lambda url: self._baseline(url, is_cancelled), base_urls)))
+
+            jobs = [(url, path) for url in base_urls for path in self.paths]
+            outcomes = pool.map(
+                lambda job: self._probe(job[0], job[1], baselines[job[0]], is_cancelled), jobs)
+
+            exposed = {url: [] for url in base_urls}
+            for (url, path), is_exposed in zip(jobs, outcomes):
+                if is_exposed:
+                    exposed[url].append(path)
+
+        unreachable = {url: self._unreachable[_endpoint(url)] for url in base_urls
+                       if _endpoint(url) in self._unreachable}
+        return exposed, unreachable
@@ -0,0 +1,194 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DURATION_BUCKETS = [0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300]
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(**labels):
+    """Format a label set, escaping values as the exposition format requires"""
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class MetricsExporter:
+    """Serves check results as Prometheus metrics from a background-refreshed cache"""
+
+    def __init__(self, run_checks, interval=300, listen="127.0.0.1:9877"):
+        self.run_checks = run_checks
+        self.interval = interval
+        host, _, port = listen.rpartition(':')
+        self.address = (host or "127.0.0.1", int(port))
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._histograms = {}
+        self._scan_metrics = ""
+        self._last_success = 0
+        self._last_scan_duration = 0
+        self._scan_errors = 0
+
+    def _observe(self, key, value):
+        """Add one observation to the cumulative duration histogram for key"""
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = {
+                "buckets": [0] * len(DURATION_BUCKETS), "sum": 0.0, "count": 0}
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                histogram["buckets"][index] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+    def _render_results(self, results):
+        """Render gauges describing one completed scan"""
+        lines = [
+            "# HELP security_check_passed Whether a security check passed (1) or failed (0).",
+            "# TYPE security_check_passed gauge",
+        ]
+        failures = {}
+        expiry = []
+        for result in results:
+            labels = _labels(host=result.get('host', ''), category=result.get('category', 'Other'),
+                             check=result['check_name'], target=result.get('target') or '')
+            lines.append(f"security_check_passed{labels} {1 if result['passed'] else 0}")
+
+            if not result['passed']:
+                key = (result.get('host', ''), result.get('severity', 'medium'))
+                failures[key] = failures.get(key, 0) + 1
+
+            days = (result.get('details') or {}).get('days_until_expiry')
+            if days is not None:
+                expiry.append((result.get('host', ''), result.get('target') or '', days))
+
+        lines += [
+            "# HELP security_check_failures Failed checks by severity.",
+            "# TYPE security_check_failures gauge",
+        ]
+        for (host, severity), count in sorted(failures.items()):
+            lines.append(f"security_check_failures{_labels(host=host, severity=severity)} {count}")
+
+        lines += [
+            "# HELP security_ssl_certificate_expiry_days Days until the TLS certificate expires.",
+            "# TYPE security_ssl_certificate_expiry_days gauge",
+        ]
+        for host, domain, days in expiry:
+            lines.append(f"security_ssl_certificate_expiry_days{_labels(host=host, domain=domain)} {days}")
+
+        return "\n".join(lines) + "\n"
+
+    def refresh(self):
+        """Run one scan and replace the cached metrics"""
+        started = time.monotonic()
+        try:
+            results = self.run_checks()
+        except Exception as e:
+            print(f"Warning: background scan failed: {e}")
+            with self._lock:
+                self._scan_errors += 1
+            return
+
+        scan_metrics = self._render_results(results)
+        with self._lock:
+            # A check returning several results stamps its one duration on
+            # each of them: observe each check call once per result name
+            observed = set()
+            for result in results:
+                if 'duration' not in result:
+                    continue
+                key = (result.get('category', 'Other'), result['check_name'])
+                if (result.get('invocation'), key) in observed:
+                    continue
+                if 'invocation' in result:
+                    observed.add((result['invocation'], key))
+                self._observe(key, result['duration'])
+            self._scan_metrics = scan_metrics
+            self._last_success = time.time()
+            self._last_scan_duration = time.monotonic() - started
+
+    def render(self, openmetrics=False):
+        """Return the cached metrics in exposition format"""
+        with self._lock:
+            lines = [self._scan_metrics.rstrip("\n")] if self._scan_metrics else []
+            lines += [
+                "# HELP security_check_duration_seconds Time spent running each check.",
+                "# TYPE security_check_duration_seconds histogram",
+            ]
+            for (category, check), histogram in sorted(self._histograms.items()):
+                for bound, count in zip(DURATION_BUCKETS, histogram["buckets"]):
+                    labels = _labels(category=category, check=check, le=bound)
+                    lines.append(f"security_check_duration_seconds_bucket{labels} {count}")
+                labels = _labels(category=category, check=check, le="+Inf")
+                lines.append(f"security_check_duration_seconds_bucket{labels} {histogram['count']}")
+                labels = _labels(category=category, check=check)
+                lines.append(f"security_check_duration_seconds_sum{labels} {histogram['sum']}")
+                lines.append(f"security_check_duration_seconds_count{labels} {histogram['count']}")
+
+            lines += [
+                "# HELP security_scan_last_success_timestamp_seconds Completion time of the last successful scan.",
+                "# TYPE security_scan_last_success_timestamp_seconds gauge",
+                f"security_scan_last_success_timestamp_seconds {self._last_success}",
+                "# HELP security_scan_last_duration_seconds Duration of the last successful scan.",
+                "# TYPE security_scan_last_duration_seconds gauge",
+                f"security_scan_last_duration_seconds {self._last_scan_duration}",
+            ]
+            # OpenMetrics names a counter family without its _total suffix
+            errors_family = "security_scan_errors" if openmetrics else "security_scan_errors_total"
+            lines += [
+                f"# HELP {errors_family} Background scans that failed since start.",
+                f"# TYPE {errors_family} counter",
+                f"security_scan_errors_total {self._scan_errors}",
+            ]
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _refresh_loop(self):
+        """Refresh the cache until stopped"""
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def _handler(self):
+        """Build the request handler bound to this exporter"""
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                body = exporter.render(openmetrics).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MetricsHandler
+
+    def serve_forever(self):
+        """Start background refreshes and serve /metrics until interrupted"""
+        refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        refresher.start()
+
+        server = ThreadingHTTPServer(self.address, self._handler())
+        print(f"📈 Serving metrics on http://{self.address[0]}:{self.address[1]}/metrics")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stop.set()
+            server.server_close()
@@ -1,60 +1,180 @@
+import html
+import io
 import json
 from datetime import datetime
 
 
+SEVERITY_ORDER = ["critical", "high", "medium", "low"]
+
+STATUS_LABELS = {"PASS": "✅ PASS", "FAIL": "❌ FAIL", "TIMEOUT": "⏱️ TIMEOUT"}
+
+HTML_PAGE_SIZE = 200
+
+
 class ReportGenerator:
     def __init__(self, results):
         self.results = results
         self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.summary = self._aggregate()
 
-    def generate_console_report(self):
-        """Generate a console-friendly report"""
-        report = f"\n🔒 Security Checklist Report - {self.timestamp}\n"
-        report += "=" * 60 + "\n"
-
-        passed = sum(1 for r in self.results if r['passed'])
-        total = len(self.results)
+    @classmethod
+    def from_json_reports(cls, paths):
+        """Build a generator that merges several JSON reports"""
+        results = []
+        for path in paths:
+            with open(path, 'r') as f:
+                results.extend(json.load(f).get('results', []))
+        return cls(results)
 
-        report += f"Overall Score: {passed}/{total} ({(passed/total*100):.1f}%)\n\n"
+    def _aggregate(self):
+        """Build summary, category, severity and host rollups in one pass"""
+        summary = {"total_checks": 0, "passed": 0, "failed": 0, "timed_out": 0}
+        categories, severities, hosts = {}, {}, {}
 
-        # Group by category
-        categories = {}
         for result in self.results:
-            category = result.get('category', 'Other')
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(result)
+            outcome = "passed" if result['passed'] else "failed"
+            summary["total_checks"] += 1
+            summary[outcome] += 1
+            if result.get('status') == 'TIMEOUT':
+                summary["timed_out"] += 1
+
+            for rollup, key in ((categories, result.get('category', 'Other')),
+                                (hosts, result.get('host', 'unknown'))):
+                counts = rollup.get(key)
+                if counts is None:
+                    counts = rollup[key] = {"total": 0, "passed": 0, "failed": 0}
+                counts["total"] += 1
+                counts[outcome] += 1
+
+            if not result['passed']:
+                severity = result.get('severity', 'medium')
+                severities[severity] = severities.get(severity, 0) + 1
 
-        for category, checks in categories.items():
-            report += f"📋 {category} Checks\n"
-            report += "-" * 30 + "\n"
+        summary["by_category"] = categories
+        summary["failed_by_severity"] = {
+            severity: severities[severity]
+            for severity in sorted(severities, key=self._severity_rank)}
+        summary["by_host"] = hosts
+        return summary
 
-            for check in checks:
-                status = "✅ PASS" if check['passed'] else "❌ FAIL"
-                report += f"{status} {check['check_name']}\n"
-                report += f"     {check['message']}\n\n"
+    @staticmethod
+    def _status(result):
+        """PASS, FAIL or TIMEOUT for a result"""
+        if result.get('status') == 'TIMEOUT':
+            return "TIMEOUT"
+        return "PASS" if result['passed'] else "FAIL"
 
-        return report
+    @staticmethod
+    def _severity_rank(severity):
+        """Sort key placing the most severe levels first"""
+        return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else len(SEVERITY_ORDER)
+
+    @staticmethod
+    def _score(counts):
+        """Format passed/total as a score, guarding against empty reports"""
+        total = counts.get("total", counts.get("total_checks", 0))
+        percentage = counts["passed"] / total * 100 if total else 0.0
+        return f"{counts['passed']}/{total} ({percentage:.1f}%)"
+
+    def write_report(self, out, format_type="console"):
+        """Stream a report to a path or file object"""
+        writer = {
+            "json": self._write_json,
+            "html": self._write_html,
+        }.get(format_type, self._write_console)
+
+        if isinstance(out, str):
+            with open(out, 'w') as f:
+                writer(f)
+        else:
+            writer(out)
+
+    def _render(self, format_type):
+        """Render a report to a string"""
+        buffer = io.StringIO()
+        self.write_report(buffer, format_type)
+        return buffer.getvalue()
+
+    def generate_console_report(self):
+        """Generate a console-friendly report"""
+        return self._render("console")
 
     def generate_json_report(self):
         """Generate a JSON report"""
-        report_data = {
-            "timestamp": self.timestamp,
-            "summary": {
-                "total_checks": len(self.results),
-                "passed": sum(1 for r in self.results if r['passed']),
-                "failed": sum(1 for r in self.results if not r['passed'])
-            },
-            "results": self.results
-        }
-        return json.dumps(report_data, indent=2)
+        return self._render("json")
 
     def generate_html_report(self):
         """Generate an HTML report"""
-        passed = sum(1 for r in self.results if r['passed'])
-        total = len(self.results)
+        return self._render("html")
+
+    def _write_console(self, out):
+        """Write the console report section by section"""
+        out.write(f"\n🔒 Security Checklist Report - {self.timestamp}\n")
+        out.write("=" * 60 + "\n")
+        out.write(f"Overall Score: {self._score(self.summary)}\n")
 
-        html = f"""
+        if self.summary["failed_by_severity"]:
+            failed = ", ".join(f"{severity}: {count}" for severity, count
+                               in self.summary["failed_by_severity"].items())
+            out.write(f"Failed by severity: {failed}\n")
+
+        if self.summary["timed_out"]:
+            out.write(f"Timed out: {self.summary['timed_out']} checks did not finish before the deadline\n")
+
+        multiple_hosts = len(self.summary["by_host"]) > 1
+        if multiple_hosts:
+            out.write(f"Hosts: {len(self.summary['by_host'])}\n")
+        out.write("\n")
+
+        # Results arrive grouped by host and category, so a header is
+        # written whenever the group changes instead of regrouping them
+        group = None
+        for check in self.results:
+            host = check.get('host', 'unknown')
+            category = check.get('category', 'Other')
+            if (host, category) != group:
+                group = (host, category)
+                title = f"{category} Checks ({host})" if multiple_hosts else f"{category} Checks"
+                out.write(f"📋 {title}\n")
+                out.write("-" * 30 + "\n")
+
+            out.write(f"{STATUS_LABELS[self._status(check)]} {check['check_name']}\n")
+            out.write(f"     {check['message']}\n\n")
+
+    def _write_json(self, out):
+        """Write the JSON report one result at a time"""
+        out.write("{\n")
+        out.write(f'  "timestamp": {json.dumps(self.timestamp)},\n')
+        out.write(f'  "summary": {json.dumps(self.summary)},\n')
+        out.write('  "results": [')
+        for index, result in enumerate(self.results):
+            out.write(",\n    " if index else "\n    ")
+            out.write(json.dumps(result))
+        out.write("\n  ]\n}\n")
+
+    def _write_html_rollup(self, out, title, rollup):
+        """Write a pass/fail rollup table"""
+        out.write(f"""
+    <h2>{html.escape(title)}</h2>
+    <table class="rollup">
+        <tr><th>Name</th><th>Passed</th><th>Failed</th><th>Score</th></tr>
+""")
+        for name, counts in rollup.items():
+            out.write(f"        <tr><td>{html.escape(str(name))}</td><td>{counts['passed']}</td>"
+                      f"<td>{counts['failed']}</td><td>{self._score(counts)}</td></tr>\n")
+        out.write("    </table>\n")
+
+    def _write_html_filter(self, out, field, label, values):
+        """Write a select box that filters result rows on one column"""
+        out.write(f'        <label>{label} <select data-filter="{field}"><option value="">All</option>')
+        for value in values:
+            value = html.escape(str(value))
+            out.write(f'<option value="{value}">{value}</option>')
+        out.write("</select></label>\n")
+
+    def _write_html(self, out):
+        """Write the HTML report with paginated, filterable result rows"""
+        out.write(f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -64,35 +184,111 @@ class ReportGenerator:
         .header {{ background: #f4f4f4; padding: 20px; border-radius: 5px; }}
         .pass {{ color: green; }}
         .fail {{ color: red; }}
-        .check {{ margin: 10px 0; padding: 10px; border-left: 4px solid #ccc; }}
-        .check.pass {{ border-left-color: green; }}
-        .check.fail {{ border-left-color: red; }}
+        .timeout {{ color: darkorange; }}
+        table {{ border-collapse: collapse; margin: 10px 0; }}
+        th, td {{ padding: 6px 10px; border-bottom: 1px solid #ddd; text-align: left; }}
+        tr.check.pass td:first-child {{ border-left: 4px solid green; }}
+        tr.check.fail td:first-child {{ border-left: 4px solid red; }}
+        tr.check.timeout td:first-child {{ border-left: 4px solid darkorange; }}
+        .filters label {{ margin-right: 15px; }}
+        .pager {{ margin: 10px 0; }}
     </style>
 </head>
 <body>
     <div class="header">
         <h1>🔒 Security Checklist Report</h1>
         <p>Generated: {self.timestamp}</p>
-        <p>Score: {passed}/{total} ({(passed/total*100):.1f}%)</p>
+        <p>Score: {self._score(self.summary)}</p>
     </div>
-    
-    <div class="results">
-"""
+""")
 
-        for result in self.results:
-            status_class = "pass" if result['passed'] else "fail"
-            status_text = "PASS" if result['passed'] else "FAIL"
+        self._write_html_rollup(out, "Categories", self.summary["by_category"])
+        if len(self.summary["by_host"]) > 1:
+            self._write_html_rollup(out, "Hosts", self.summary["by_host"])
 
-            html += f"""
-        <div class="check {status_class}">
-            <h3>{result['check_name']} - <span class="{status_class}">{status_text}</span></h3>
-            <p>{result['message']}</p>
-        </div>
-"""
+        if self.summary["failed_by_severity"]:
+            out.write("""
+    <h2>Failed by Severity</h2>
+    <table class="rollup">
+        <tr><th>Severity</th><th>Failed</th></tr>
+""")
+            for severity, count in self.summary["failed_by_severity"].items():
+                out.write(f"        <tr><td>{html.escape(severity)}</td><td>{count}</td></tr>\n")
+            out.write("    </table>\n")
 
-        html += """
-    </div>
+        out.write("""
+    <h2>Results</h2>
+    <div class="filters">
+""")
+        self._write_html_filter(out, "status", "Status", ["PASS", "FAIL", "TIMEOUT"])
+        self._write_html_filter(out, "category", "Category", self.summary["by_category"])
+        self._write_html_filter(out, "severity", "Severity", SEVERITY_ORDER)
+        if len(self.summary["by_host"]) > 1:
+            self._write_html_filter(out, "host", "Host", self.summary["by_host"])
+        out.write("""    </div>
+    <div class="pager"></div>
+    <table class="results">
+        <thead><tr><th>Status</th><th>Host</th><th>Category</th><th>Check</th><th>Severity</th><th>Message</th></tr></thead>
+""")
+
+        # Rows are emitted in fixed-size tbody chunks so the browser can lay
+        # out one page at a time; the script below pages over filtered rows
+        for index, result in enumerate(self.results):
+            if index % HTML_PAGE_SIZE == 0:
+                if index:
+                    out.write("        </tbody>\n")
+                out.write("        <tbody>\n")
+
+            status_text = self._status(result)
+            status_class = status_text.lower()
+            host = html.escape(str(result.get('host', 'unknown')))
+            category = html.escape(str(result.get('category', 'Other')))
+            severity = html.escape(str(result.get('severity', 'medium')))
+            out.write(f'            <tr class="check {status_class}" data-status="{status_text}" '
+                      f'data-host="{host}" data-category="{category}" data-severity="{severity}">'
+                      f'<td class="{status_class}">{status_text}</td><td>{host}</td><td>{category}</td>'
+                      f'<td>{html.escape(result["check_name"])}</td><td>{severity}</td>'
+                      f'<td>{html.escape(str(result["message"]))}</td></tr>\n')
+        if self.results:
+            out.write("        </tbody>\n")
+
+        out.write(f"""    </table>
+    <div class="pager"></div>
+    <script>
+        var pageSize = {HTML_PAGE_SIZE}, page = 0;
+        var rows = Array.prototype.slice.call(document.querySelectorAll('tr.check'));
+        var filters = Array.prototype.slice.call(document.querySelectorAll('select[data-filter]'));
+
+        function matching() {{
+            return rows.filter(function (row) {{
+                return filters.every(function (select) {{
+                    return !select.value || row.dataset[select.dataset.filter] === select.value;
+                }});
+            }});
+        }}
+
+        function render() {{
+            var visible = matching();
+            var pages = Math.max(1, Math.ceil(visible.length / pageSize));
+            page = Math.min(page, pages - 1);
+            rows.forEach(function (row) {{ row.style.display = 'none'; }});
+            visible.slice(page * pageSize, (page + 1) * pageSize).forEach(function (row) {{ row.style.display = ''; }});
+            document.querySelectorAll('.pager').forEach(function (pager) {{
+                pager.innerHTML = '';
+                for (var i = 0; i < pages; i++) {{
+                    var link = document.createElement('button');
+                    link.textContent = i + 1;
+                    link.disabled = i === page;
+                    link.onclick = (function (target) {{ return function () {{ page = target; render(); }}; }})(i);
+                    pager.appendChild(link);
+                }}
+                pager.appendChild(document.createTextNode(' ' + visible.length + ' results'));
+            }});
+        }}
+
+        filters.forEach(function (select) {{ select.onchange = function () {{ page = 0; render(); }}; }});
+        render();
+    </script>
 </body>
 </html>
-"""
-        return html
+""")
@@ -0,0 +1,113 @@
+import os
+import time
+
+
+def _read_load_per_cpu():
+    """1-minute load average divided by the number of CPUs"""
+    try:
+        with open('/proc/loadavg', 'r') as f:
+            return float(f.read().split()[0]) / (os.cpu_count() or 1)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def _read_pressure(resource):
+    """'some avg10' stall percentage from /proc/pressure (PSI), if available"""
+    try:
+        with open(f'/proc/pressure/{resource}', 'r') as f:
+            for line in f:
+                if line.startswith('some'):
+                    for field in line.split()[1:]:
+                        name, _, value = field.partition('=')
+                        if name == 'avg10':
+                            return float(value)
+    except (OSError, ValueError):
+        pass
+    return 0.0
+
+
+class ScanBudget:
+    """Paces a filesystem walk to file, byte and CPU budgets, backing off under load"""
+
+    SAMPLE_INTERVAL = 1.0
+    MIN_FACTOR = 0.05
+
+    def __init__(self, files_per_second=200, bytes_per_second=5 * 1024 * 1024,
+                 cpu_share=0.25, max_load_per_cpu=0.7, max_pressure=10.0,
+                 max_walk_seconds=0):
+        self.files_per_second = files_per_second
+        self.bytes_per_second = bytes_per_second
+        self.cpu_share = cpu_share
+        self.max_load_per_cpu = max_load_per_cpu
+        self.max_pressure = max_pressure
+        self.max_walk_seconds = max_walk_seconds
+
+        self.factor = 1.0
+        self._sampled_at = 0.0
+        self.start_walk()
+
+    @classmethod
+    def from_config(cls, budget_config):
+        """Build a budget from the 'scan.budget' config section, or None if disabled"""
+        if not budget_config.get('enabled'):
+            return None
+        return cls(
+            files_per_second=budget_config.get('files_per_second', 200),
+            bytes_per_second=budget_config.get('bytes_per_second', 5 * 1024 * 1024),
+            cpu_share=budget_config.get('cpu_share', 0.25),
+            max_load_per_cpu=budget_config.get('max_load_per_cpu', 0.7),
+            max_pressure=budget_config.get('max_pressure', 10.0),
+            max_walk_seconds=budget_config.get('max_walk_seconds', 0))
+
+    def start_walk(self):
+        """Reset the pacing clocks at the start of a walk"""
+        now = time.monotonic()
+        self.walk_started = now
+        self._ready_at = now
+        self._cpu_mark = time.process_time()
+        self._wall_mark = now
+
+    def window_expired(self):
+        """True once the walk has used its time slice and should pause"""
+        return bool(self.max_walk_seconds) and \
+            time.monotonic() - self.walk_started >= self.max_walk_seconds
+
+    def _adapt(self, now):
+        """Scale the budget down while the system is loaded or stalling"""
+        if now - self._sampled_at < self.SAMPLE_INTERVAL:
+            return
+        self._sampled_at = now
+
+        factor = 1.0
+        load = _read_load_per_cpu()
+        if self.max_load_per_cpu and load > self.max_load_per_cpu:
+            factor = self.max_load_per_cpu / load
+        pressure = max(_read_pressure('io'), _read_pressure('cpu'))
+        if self.max_pressure and pressure > self.max_pressure:
+            factor *= self.max_pressure / pressure
+        self.factor = max(self.MIN_FACTOR, factor)
+
+    def charge(self, files=0, nbytes=0):
+        """Account for work done and sleep long enough to stay within budget"""
+        now = time.monotonic()
+        self._adapt(now)
+
+        cost = 0.0
+        if self.files_per_second:
+            cost = max(cost, files / self.files_per_second)
+        if self.bytes_per_second:
+            cost = max(cost, nbytes / self.bytes_per_second)
+        self._ready_at = max(self._ready_at, now) + cost / self.factor
+        delay = self._ready_at - now
+
+        # Keep this process's CPU time under cpu_share of elapsed wall time
+        if self.cpu_share:
+            cpu_used = time.process_time() - self._cpu_mark
+            wall = now - self._wall_mark
+            delay = max(delay, cpu_used / (self.cpu_share * self.factor) - wall)
+
+        if delay > 0:
+            time.sleep(delay)
+        if self.cpu_share and now - self._wall_mark >= self.SAMPLE_INTERVAL:
+            self._cpu_mark = time.process_time()
+            self._wall_mark = time.monotonic()
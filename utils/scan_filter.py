@@ -0,0 +1,100 @@
+import re
+
+
+BINARY_SNIFF_SIZE = 8192
+
+
+def _glob_to_regex(glob):
+    """Translate a gitignore-style glob into a regular expression"""
+    regex = []
+    i = 0
+    while i < len(glob):
+        char = glob[i]
+        if glob.startswith('**/', i):
+            regex.append('(?:.*/)?')
+            i += 3
+            continue
+        if glob.startswith('**', i):
+            regex.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            regex.append('[^/]*')
+        elif char == '?':
+            regex.append('[^/]')
+        elif char == '[' and ']' in glob[i + 2:]:
+            end = glob.index(']', i + 2)
+            body = glob[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            regex.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end
+        elif char == '\\' and i + 1 < len(glob):
+            i += 1
+            regex.append(re.escape(glob[i]))
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return ''.join(regex)
+
+
+def _compile_pattern(line):
+    """Compile one gitignore line into (regex, negate, directories_only), or None"""
+    line = line.rstrip()
+    if not line or line.startswith('#'):
+        return None
+
+    negate = line.startswith('!')
+    if negate:
+        line = line[1:]
+    directories_only = line.endswith('/')
+    line = line.rstrip('/')
+
+    # A slash anywhere but the end anchors the pattern to the walk root;
+    # otherwise it matches a name at any depth
+    anchored = '/' in line
+    prefix = '' if anchored else '(?:.*/)?'
+    regex = re.compile(prefix + _glob_to_regex(line.lstrip('/')) + r'\Z')
+    return regex, negate, directories_only
+
+
+class ScanFilter:
+    """Decides which paths a filesystem walk skips
+
+    Patterns follow .gitignore rules and match paths relative to the walk
+    root: a trailing slash matches directories only, a leading or inner
+    slash anchors the pattern, ** spans directories and ! re-includes a
+    path an earlier pattern excluded. Excluded directories are pruned, so
+    nothing below them is visited.
+    """
+
+    def __init__(self, patterns=(), max_file_size=0, skip_binary=False):
+        self.rules = [rule for rule in map(_compile_pattern, patterns) if rule]
+        self.max_file_size = max_file_size
+        self.skip_binary = skip_binary
+
+    @classmethod
+    def from_config(cls, exclude_config):
+        """Build a filter from the 'scan.exclude' config section"""
+        return cls(patterns=exclude_config.get('patterns', []),
+                   max_file_size=exclude_config.get('max_file_size', 0),
+                   skip_binary=exclude_config.get('skip_binary', False))
+
+    def excluded(self, relative_path, is_dir):
+        """True if a path below the walk root should be skipped"""
+        # The last matching pattern decides, as in .gitignore
+        for regex, negate, directories_only in reversed(self.rules):
+            if directories_only and not is_dir:
+                continue
+            if regex.match(relative_path):
+                return not negate
+        return False
+
+    def too_large(self, size):
+        """True if a file is over the content scan size limit"""
+        return bool(self.max_file_size) and size > self.max_file_size
+
+    @staticmethod
+    def is_binary(block):
+        """True if the start of a file contains a NUL byte"""
+        return b'\0' in block[:BINARY_SNIFF_SIZE]
@@ -0,0 +1,403 @@
+import glob
+import os
+import re
+
+
+NGINX_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>\#[^\n]*)
+  | "(?P<double>(?:\\.|[^"\\])*)"
+  | '(?P<single>(?:\\.|[^'\\])*)'
+  | (?P<punct>[{};])
+  | (?P<word>(?:\\.|[^\s{};"'\\])+)
+''', re.VERBOSE)
+
+APACHE_ARGUMENT = re.compile(r'"((?:\\.|[^"\\])*)"|\'([^\']*)\'|(\S+)')
+
+REDIRECT_CODES = {'301', '302', '303', '307', '308'}
+
+# Directives that pass requests to an application which may add X-Powered-By,
+# with the nginx directive that strips headers from that backend's responses
+NGINX_BACKENDS = {
+    'proxy_pass': 'proxy_hide_header',
+    'fastcgi_pass': 'fastcgi_hide_header',
+    'uwsgi_pass': 'uwsgi_hide_header',
+    'scgi_pass': 'scgi_hide_header',
+    'grpc_pass': 'grpc_hide_header',
+}
+APACHE_BACKENDS = {'proxypass', 'proxypassmatch'}
+
+NGINX_HEADER_DIRECTIVES = {'add_header', 'more_set_headers', 'more_clear_headers'} | \
+    set(NGINX_BACKENDS.values())
+APACHE_HEADER_DIRECTIVES = {'header', 'requestheader'}
+
+# Apache sections whose contents apply as if they were written inline
+APACHE_CONDITIONALS = {'ifmodule', 'ifdefine', 'ifversion', 'ifdirective', 'iffile'}
+
+_file_cache = {}
+
+
+class Directive:
+    """One configuration directive, with its nested block for sections"""
+
+    __slots__ = ('name', 'args', 'block', 'file', 'line')
+
+    def __init__(self, name, args, block, file, line):
+        self.name = name
+        self.args = args
+        self.block = block
+        self.file = file
+        self.line = line
+
+
+def _cached_parse(path, parse):
+    """Parse a single file, reusing the previous result while its mtime is unchanged"""
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with open(path, 'r', errors='replace') as f:
+        directives = parse(f.read(), path)
+    _file_cache[path] = (signature, directives)
+    return directives
+
+
+def _include_paths(pattern, base_dir):
+    """Files an include pattern refers to, relative paths resolved against base_dir"""
+    pattern = os.path.join(base_dir, pattern)
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*')
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def _parse_nginx_text(text, path):
+    """Parse nginx syntax into a directive tree, leaving includes unexpanded"""
+    root = []
+    stack = [root]
+    words = []
+    line = 1
+    start_line = 1
+    position = 0
+
+    while position < len(text):
+        match = NGINX_TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"{path}:{line}: unexpected character {text[position]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        token = match.group(kind)
+        if kind == 'space':
+            line += token.count('\n')
+            continue
+        if kind == 'comment':
+            continue
+
+        if kind != 'punct':
+            if not words:
+                start_line = line
+            words.append(token)
+            line += token.count('\n')
+        elif token == '}':
+            if words or len(stack) == 1:
+                raise ValueError(f"{path}:{line}: unexpected '}}'")
+            stack.pop()
+        elif not words:
+            raise ValueError(f"{path}:{line}: unexpected '{token}'")
+        else:
+            block = [] if token == '{' else None
+            stack[-1].append(Directive(words[0], words[1:], block, path, start_line))
+            if block is not None:
+                stack.append(block)
+            words = []
+
+    if words or len(stack) > 1:
+        raise ValueError(f"{path}:{line}: unexpected end of file")
+    return root
+
+
+def _parse_apache_text(text, path):
+    """Parse Apache syntax into a directive tree, leaving includes unexpanded
+
+    Directive and section names are case-insensitive and stored lowercased.
+    """
+    root = []
+    stack = [(None, root)]
+    lines = text.splitlines()
+    index = 0
+
+    while index < len(lines):
+        start_line = index + 1
+        line = lines[index].strip()
+        index += 1
+        while line.endswith('\\') and index < len(lines):
+            line = line[:-1] + ' ' + lines[index].strip()
+            index += 1
+        if not line or line.startswith('#'):
+            continue
+
+        if line.startswith('</'):
+            name = line[2:].rstrip('>').strip().lower()
+            if stack[-1][0] != name:
+                raise ValueError(f"{path}:{start_line}: unexpected </{name}>")
+            stack.pop()
+            continue
+
+        section = line.startswith('<')
+        if section:
+            line = line[1:].rstrip('>')
+        args = [next(group for group in match.groups() if group is not None)
+                for match in APACHE_ARGUMENT.finditer(line)]
+        name = args.pop(0).lower()
+        block = [] if section else None
+        stack[-1][1].append(Directive(name, args, block, path, start_line))
+        if section:
+            stack.append((name, block))
+
+    if len(stack) > 1:
+        raise ValueError(f"{path}: <{stack[-1][0]}> is never closed")
+    return root
+
+
+def _expand(directives, base_dir, parse, include_names, seen):
+    """Copy a directive tree with include directives replaced by the files they name"""
+    expanded = []
+    for directive in directives:
+        if directive.name in include_names and directive.block is None:
+            for path in _include_paths(directive.args[0], base_dir):
+                if path in seen:
+                    raise ValueError(f"{directive.file}:{directive.line}: include loop through {path}")
+                expanded.extend(_expand(_cached_parse(path, parse), base_dir, parse,
+                                        include_names, seen | {path}))
+        elif directive.block is not None:
+            expanded.append(Directive(directive.name, directive.args,
+                                      _expand(directive.block, base_dir, parse, include_names, seen),
+                                      directive.file, directive.line))
+        else:
+            expanded.append(directive)
+    return expanded
+
+
+def load_nginx_config(path):
+    """Directive tree of an nginx config with includes expanded"""
+    path = os.path.abspath(path)
+    return _expand(_cached_parse(path, _parse_nginx_text), os.path.dirname(path),
+                   _parse_nginx_text, {'include'}, {path})
+
+
+def load_apache_config(path):
+    """Directive tree of an Apache config with includes expanded, and its ServerRoot"""
+    path = os.path.abspath(path)
+    directives = _cached_parse(path, _parse_apache_text)
+    server_root = os.path.dirname(path)
+    for directive in directives:
+        if directive.name == 'serverroot' and directive.args:
+            server_root = directive.args[0]
+    return _expand(directives, server_root, _parse_apache_text,
+                   {'include', 'includeoptional'}, {path}), server_root
+
+
+def _find(directives, name):
+    """Directives with a name, in order"""
+    return [directive for directive in directives if directive.name == name]
+
+
+def _last_value(directives, name, default=None):
+    """First argument of the last directive with a name, as later ones override"""
+    found = _find(directives, name)
+    return found[-1].args[0] if found and found[-1].args else default
+
+
+def _walk(directives, descend=lambda directive: True):
+    """Yield directives depth first, entering the blocks descend() accepts"""
+    for directive in directives:
+        yield directive
+        if directive.block is not None and descend(directive):
+            yield from _walk(directive.block, descend)
+
+
+def _redirects_to_https(name, args):
+    """True if an nginx return/rewrite or Apache Redirect*/RewriteRule sends clients to https://"""
+    if name == 'return':
+        if len(args) == 1:
+            return args[0].startswith('https://')
+        return args[0] in REDIRECT_CODES and args[1].startswith('https://')
+    if name in ('rewrite', 'rewriterule'):
+        return len(args) >= 2 and args[1].startswith('https://')
+    if name in ('redirect', 'redirectmatch', 'redirectpermanent', 'redirecttemp'):
+        return any(arg.startswith('https://') for arg in args)
+    return False
+
+
+def _hides_powered_by(headers, names):
+    """True if one of the named header directives removes X-Powered-By"""
+    for name, *args in headers:
+        if name not in names or 'x-powered-by' not in ' '.join(args).lower():
+            continue
+        if name != 'header' or 'unset' in (arg.lower() for arg in args):
+            return True
+    return False
+
+
+def _virtual_host(server, directive, names, listen, certificates, server_tokens,
+                  headers, redirects, backend, hides_powered_by):
+    """Summary of one virtual host as the web server checks evaluate it"""
+    ports = sorted({port for port, _ in listen})
+    primary = names[0] if names else '_'
+    return {
+        "server": server,
+        "file": directive.file,
+        "line": directive.line,
+        "names": names,
+        "target": f"{primary}:{'/'.join(str(port) for port in ports)}",
+        "listen": [{"port": port, "ssl": ssl} for port, ssl in listen],
+        "plain_ports": sorted({port for port, ssl in listen if not ssl}),
+        "tls": any(ssl for _, ssl in listen),
+        "certificates": certificates,
+        "server_tokens": server_tokens,
+        "headers": headers,
+        "redirects_to_https": redirects,
+        "hides_powered_by": hides_powered_by,
+        "backend": backend,
+    }
+
+
+def _nginx_inherit(inherited, block):
+    """Header directives in effect in a block: each is inherited unless the block sets its own"""
+    headers = []
+    for name in sorted(NGINX_HEADER_DIRECTIVES):
+        headers += [[name] + directive.args for directive in _find(block, name)] or \
+            [header for header in inherited if header[0] == name]
+    return headers
+
+
+def _nginx_backends(block, headers):
+    """(pass directive, header directives in effect there) for every backend below a block"""
+    for directive in block:
+        if directive.name in NGINX_BACKENDS:
+            yield directive.name, headers
+        elif directive.block is not None:
+            yield from _nginx_backends(directive.block, _nginx_inherit(headers, directive.block))
+
+
+def _nginx_listen(args):
+    """(port, ssl) of an nginx listen directive"""
+    address = args[0]
+    if address.startswith('unix:'):
+        return None
+    port = address.rsplit(':', 1)[-1] if not address.endswith(']') else '80'
+    if not port.isdigit():
+        port = '80'
+    return int(port), 'ssl' in args[1:]
+
+
+def nginx_virtual_hosts(path):
+    """Every server block of an nginx config tree"""
+    directives = load_nginx_config(path)
+    conf_dir = os.path.dirname(os.path.abspath(path))
+    hosts = []
+
+    for http in _find(directives, 'http'):
+        http_tokens = _last_value(http.block, 'server_tokens', 'on')
+        http_certificates = [directive.args[0] for directive in _find(http.block, 'ssl_certificate')]
+        http_headers = _nginx_inherit([], http.block)
+
+        for server in _find(http.block, 'server'):
+            block = server.block
+            listen = [_nginx_listen(directive.args) for directive in _find(block, 'listen')]
+            listen = [entry for entry in listen if entry] or [(80, False)]
+            if _last_value(block, 'ssl') == 'on':
+                listen = [(port, True) for port, _ in listen]
+
+            names = [name for directive in _find(block, 'server_name')
+                     for name in directive.args if name]
+            certificates = [directive.args[0] for directive in _find(block, 'ssl_certificate')] \
+                or http_certificates
+            headers = _nginx_inherit(http_headers, block)
+
+            # Redirects count at server level, in if blocks and in location /
+            redirects = any(
+                _redirects_to_https(directive.name, directive.args)
+                for directive in _walk(block, lambda directive: directive.name == 'if' or (
+                    directive.name == 'location' and directive.args[-1:] == ['/'])))
+            # Every backend must be hidden by the directives in effect in its own location
+            backends = list(_nginx_backends(block, headers))
+            hides_powered_by = _hides_powered_by(headers, {'more_clear_headers'}) or bool(backends) and all(
+                _hides_powered_by(location_headers, {'more_clear_headers', NGINX_BACKENDS[backend]})
+                for backend, location_headers in backends)
+
+            hosts.append(_virtual_host(
+                'nginx', server, names, listen,
+                [os.path.join(conf_dir, certificate) for certificate in certificates],
+                _last_value(block, 'server_tokens', http_tokens),
+                headers, redirects, bool(backends), hides_powered_by))
+
+    return hosts
+
+
+def _apache_backend(directives):
+    """True if any directive passes requests to an application or PHP handler"""
+    return any(directive.name in APACHE_BACKENDS or (
+        directive.name in ('sethandler', 'addhandler', 'addtype')
+        and any('proxy:' in arg or 'php' in arg for arg in directive.args))
+        for directive in directives)
+
+
+def apache_virtual_hosts(path):
+    """Every VirtualHost section of an Apache config tree
+
+    Handlers set outside any VirtualHost, as Debian's mods-enabled/php*.conf
+    and conf-enabled/php*-fpm.conf do, apply to every virtual host.
+    """
+    directives, server_root = load_apache_config(path)
+
+    def inline(directive):
+        return directive.name in APACHE_CONDITIONALS
+
+    top_level = list(_walk(directives, inline))
+    server_tokens = _last_value(top_level, 'servertokens', 'Full')
+    global_headers = [[directive.name] + directive.args for directive in top_level
+                      if directive.name in APACHE_HEADER_DIRECTIVES]
+    global_backend = _apache_backend(_walk(directives, lambda directive: directive.name != 'virtualhost'))
+    hosts = []
+
+    for virtual_host in _find(top_level, 'virtualhost'):
+        contents = list(_walk(virtual_host.block))
+        block = list(_walk(virtual_host.block, inline))
+
+        ssl = (_last_value(block, 'sslengine', 'off') or '').lower() == 'on'
+        listen = []
+        for address in virtual_host.args:
+            port = address.rsplit(':', 1)[-1] if ':' in address else '80'
+            listen.append((int(port) if port.isdigit() else 80, ssl))
+
+        names = [directive.args[0] for directive in _find(block, 'servername') if directive.args]
+        names += [name for directive in _find(block, 'serveralias') for name in directive.args]
+        certificates = [directive.args[0] for directive in _find(block, 'sslcertificatefile')]
+        headers = global_headers + [[directive.name] + directive.args for directive in contents
+                                    if directive.name in APACHE_HEADER_DIRECTIVES]
+        redirects = any(_redirects_to_https(directive.name, directive.args) for directive in contents)
+        backend = global_backend or _apache_backend(contents)
+
+        hosts.append(_virtual_host(
+            'apache', virtual_host, names, listen,
+            [os.path.join(server_root, certificate) for certificate in certificates],
+            server_tokens, headers, redirects, backend, _hides_powered_by(headers, {'header'})))
+
+    return hosts
+
+
+VIRTUAL_HOST_LOADERS = {
+    'nginx': nginx_virtual_hosts,
+    'apache': apache_virtual_hosts,
+}
+
+
+def find_virtual_hosts(config_files):
+    """Virtual hosts of every existing config in a {'nginx': [...], 'apache': [...]} mapping"""
+    hosts = []
+    for server, paths in config_files.items():
+        for path in paths:
+            if os.path.isfile(path):
+                hosts.extend(VIRTUAL_HOST_LOADERS[server](path))
+    return hosts
@@ -0,0 +1,131 @@
+import base64
+import re
+from datetime import datetime, timezone
+
+
+SIGNATURE_ALGORITHMS = {
+    '1.2.840.113549.1.1.4': 'md5WithRSAEncryption',
+    '1.2.840.113549.1.1.5': 'sha1WithRSAEncryption',
+    '1.2.840.113549.1.1.10': 'rsassaPss',
+    '1.2.840.113549.1.1.11': 'sha256WithRSAEncryption',
+    '1.2.840.113549.1.1.12': 'sha384WithRSAEncryption',
+    '1.2.840.113549.1.1.13': 'sha512WithRSAEncryption',
+    '1.2.840.10045.4.1': 'ecdsa-with-SHA1',
+    '1.2.840.10045.4.3.2': 'ecdsa-with-SHA256',
+    '1.2.840.10045.4.3.3': 'ecdsa-with-SHA384',
+    '1.2.840.10045.4.3.4': 'ecdsa-with-SHA512',
+    '1.3.101.112': 'ed25519',
+    '1.3.101.113': 'ed448',
+}
+
+KEY_TYPES = {
+    '1.2.840.113549.1.1.1': 'RSA',
+    '1.2.840.10045.2.1': 'EC',
+    '1.3.101.112': 'Ed25519',
+    '1.3.101.113': 'Ed448',
+}
+
+PEM_CERTIFICATE = re.compile(
+    rb'-----BEGIN CERTIFICATE-----(.+?)-----END CERTIFICATE-----', re.DOTALL)
+
+EC_CURVE_BITS = {
+    '1.2.840.10045.3.1.7': 256,
+    '1.3.132.0.34': 384,
+    '1.3.132.0.35': 521,
+    '1.3.132.0.10': 256,
+}
+
+
+def _read_tlv(data, offset):
+    """Read one DER element, returning (tag, content, next_offset)"""
+    tag = data[offset]
+    length = data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        size = length & 0x7f
+        length = int.from_bytes(data[offset:offset + size], 'big')
+        offset += size
+    return tag, data[offset:offset + length], offset + length
+
+
+def _children(data):
+    """Split the content of a constructed DER element into its elements"""
+    elements = []
+    offset = 0
+    while offset < len(data):
+        tag, content, offset = _read_tlv(data, offset)
+        elements.append((tag, content))
+    return elements
+
+
+def _decode_oid(data):
+    """Decode a DER object identifier to dotted notation"""
+    parts = [data[0] // 40, data[0] % 40]
+    value = 0
+    for byte in data[1:]:
+        value = (value << 7) | (byte & 0x7f)
+        if not byte & 0x80:
+            parts.append(value)
+            value = 0
+    return '.'.join(str(part) for part in parts)
+
+
+def _decode_time(tag, data):
+    """Decode a UTCTime or GeneralizedTime value"""
+    text = data.decode('ascii').rstrip('Z')
+    if tag == 0x17:
+        return datetime.strptime(text, '%y%m%d%H%M%S')
+    return datetime.strptime(text, '%Y%m%d%H%M%S')
+
+
+def parse_certificate(der):
+    """Extract key, signature and validity details from a DER certificate"""
+    _, certificate, _ = _read_tlv(der, 0)
+    tbs, signature_algorithm, _ = _children(certificate)
+    fields = _children(tbs[1])
+    if fields[0][0] == 0xa0:
+        fields = fields[1:]
+    _, _, issuer, validity, subject, public_key_info = fields[:6]
+
+    not_before, not_after = [_decode_time(tag, value)
+                             for tag, value in _children(validity[1])]
+
+    key_algorithm, key_bits = _children(public_key_info[1])
+    key_algorithm = _children(key_algorithm[1])
+    key_oid = _decode_oid(key_algorithm[0][1])
+    key_type = KEY_TYPES.get(key_oid, key_oid)
+
+    if key_type == 'RSA':
+        modulus = _children(_children(key_bits[1][1:])[0][1])[0][1]
+        key_size = int.from_bytes(modulus, 'big').bit_length()
+    elif key_type == 'EC':
+        key_size = EC_CURVE_BITS.get(_decode_oid(key_algorithm[1][1]), 0)
+    elif key_type in ('Ed25519', 'Ed448'):
+        key_size = 256 if key_type == 'Ed25519' else 456
+    else:
+        key_size = 0
+
+    signature_oid = _decode_oid(_children(signature_algorithm[1])[0][1])
+
+    return {
+        "key_type": key_type,
+        "key_size": key_size,
+        "signature_algorithm": SIGNATURE_ALGORITHMS.get(signature_oid, signature_oid),
+        "not_before": not_before.isoformat(),
+        "not_after": not_after.isoformat(),
+        "self_issued": issuer == subject,
+    }
+
+
+def load_pem_certificates(path):
+    """DER bytes of every certificate in a PEM file, in file order (leaf first)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return [base64.b64decode(b''.join(body.split()))
+            for body in PEM_CERTIFICATE.findall(data)]
+
+
+def certificate_days_left(certificate):
+    """Whole days from now until a parsed certificate's not_after"""
+    not_after = datetime.fromisoformat(certificate['not_after']).replace(tzinfo=timezone.utc)
+    return (not_after - datetime.now(timezone.utc)).days